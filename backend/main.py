@@ -2,20 +2,26 @@
 
 import os
 import csv
+import json
+import time
 import uuid
+import socket
+import hashlib
 import asyncio
 import logging
 import zipfile
-from io import StringIO, BytesIO
+from io import StringIO
 from pathlib import Path
-from typing import Dict, List
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
 from models import (
     AddressInput,
@@ -23,12 +29,19 @@ from models import (
     JobStatus,
     UploadResponse,
     BuildingType,
-    Confidence
+    Confidence,
+    ImageDetail,
+    VisionOptions
 )
 from services import (
     ZipService, ImageService, SearchService, VisionService,
-    CSVParserService, rate_limiter
+    CSVParserService, HTTPClientPool, SQLiteCache, ZipTable, ImageCache, ImageIndex, JobStore,
+    TaskQueue, ResultsCSVWriter, job_events,
+    rate_limiter, concurrency_limits, quota_governor, resilience, stream_zip,
+    executor, loop_monitor
 )
+from services.image_service import IMAGE_VARIANTS
+from services.results_csv import RESULTS_CSV_FIELDS
 
 # Load environment variables
 load_dotenv()
@@ -54,16 +67,85 @@ OUTPUT_DIR = BASE_DIR / "output"
 FRONTEND_DIR = BASE_DIR / "frontend" / "dist"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# Job storage (in production, use Redis or database)
+# Persistent caches live outside OUTPUT_DIR, which is served as static files
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(BASE_DIR / "cache")))
+CACHE_DB = CACHE_DIR / "cache.sqlite3"
+
+# Durable job store: status plus a checkpoint per finished address
+JOB_STORE_PATH = Path(os.getenv("JOB_STORE_PATH", str(CACHE_DIR / "jobs.sqlite3")))
+# Resume jobs a restart interrupted, from their last checkpoint
+RESUME_JOBS = os.getenv("RESUME_JOBS", "true").lower() in ("1", "true", "yes")
+# A job owned by a process on another host is taken over once it has not
+# been updated for this many seconds (same-host owners are checked by PID)
+JOB_OWNER_STALE_SECONDS = float(os.getenv("JOB_OWNER_STALE_SECONDS", "600"))
+
+# "inline": jobs run as background tasks of the API process that received
+# the upload (one process). "queue": the API only enqueues addresses and
+# `worker.py` processes pull them, sharing the job store.
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "inline").lower()
+
+# Progress streams: store poll interval for jobs run by another process,
+# and the idle time after which a keep-alive comment is sent
+SSE_POLL_INTERVAL = float(os.getenv("SSE_POLL_INTERVAL", "1.0"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+# Largest page of results one /api/results/{job_id}/json call returns
+RESULTS_PAGE_MAX = int(os.getenv("RESULTS_PAGE_MAX", "1000"))
+
+# Jobs running in this process; the job store has every job
 jobs: Dict[str, JobStatus] = {}
+# Resumed jobs (uploads run as BackgroundTasks)
+job_tasks: Set[asyncio.Task] = set()
+
+
+async def start_services() -> HTTPClientPool:
+    """
+    Start what job processing needs, in the API or a queue worker.
+
+    Returns:
+        The HTTP client pool, to be closed with `stop_services()`
+    """
+    # Share one pooled keep-alive client per upstream host across all jobs
+    http_pool = HTTPClientPool()
+    zip_service.http_client = http_pool.get("zippopotam")
+    image_service.http_client = http_pool.get("streetview")
+    search_service.http_client = http_pool.get("search")
+    if os.getenv("HTTP_WARM_UP", "true").lower() in ("1", "true", "yes"):
+        await http_pool.warm_up()
+
+    # Sample event-loop lag so blocking calls on the loop show up in /api/stats
+    loop_monitor.start()
+    return http_pool
+
+
+async def stop_services(http_pool: HTTPClientPool):
+    """Stop what `start_services()` started and close the stores."""
+    await loop_monitor.stop()
+    await http_pool.close()
+    task_queue.close()
+    job_store.close()
+    executor.shutdown()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    logger.info("Building Scanner API starting up...")
+    logger.info(f"Building Scanner API starting up ({EXECUTION_MODE} execution)...")
+
+    http_pool = await start_services()
+
+    # Queue workers pick interrupted jobs up from the queue themselves
+    if RESUME_JOBS and EXECUTION_MODE != "queue":
+        await resume_interrupted_jobs()
+
     yield
+
     logger.info("Building Scanner API shutting down...")
+    # Interrupted jobs keep their checkpoints and resume on the next start
+    for task in job_tasks:
+        task.cancel()
+    await asyncio.gather(*job_tasks, return_exceptions=True)
+    await stop_services(http_pool)
 
 
 # Create FastAPI app
@@ -88,15 +170,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class GZipExceptEventStreams:
+    """
+    GZipMiddleware that never touches the progress streams.
+
+    Only recent Starlette releases skip text/event-stream responses; older
+    ones buffer and compress them, which holds events back from the client.
+    """
+
+    def __init__(self, app, **options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **options)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/api/events/"):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+# Compress JSON responses (result pages with reasoning text shrink ~5x)
+app.add_middleware(GZipExceptEventStreams, minimum_size=1000)
+
 # Mount static files for images
 app.mount("/output", StaticFiles(directory=str(OUTPUT_DIR)), name="output")
 
+# Optional offline ZIP reference table (CSV with zip, state, city columns)
+ZIP_TABLE_PATH = os.getenv("ZIP_TABLE_PATH")
+
 # Initialize services
-zip_service = ZipService()
-image_service = ImageService(output_dir=str(OUTPUT_DIR))
-search_service = SearchService()
-vision_service = VisionService()
+zip_service = ZipService(
+    cache=SQLiteCache(CACHE_DB, namespace="zip"),
+    table=ZipTable.from_csv(ZIP_TABLE_PATH) if ZIP_TABLE_PATH else None
+)
+image_service = ImageService(
+    output_dir=str(OUTPUT_DIR),
+    image_cache=ImageCache(CACHE_DIR, CACHE_DB),
+    metadata_cache=SQLiteCache(CACHE_DB, namespace="streetview_metadata")
+)
+search_service = SearchService(cache=SQLiteCache(CACHE_DB, namespace="search"))
+vision_service = VisionService(cache=SQLiteCache(CACHE_DB, namespace="vision"))
 csv_parser_service = CSVParserService()
+job_store = JobStore(JOB_STORE_PATH)
+task_queue = TaskQueue(JOB_STORE_PATH)
+# Per-IP limits shared by every API process on this box
+rate_limiter.use_database(JOB_STORE_PATH)
+
+
+async def get_job(job_id: str, with_results: bool = True) -> JobStatus:
+    """
+    Find a job: running in this process, else in the job store (404 if unknown).
+
+    Jobs finished here, or run by another process, are read from the store
+    on every call so the status is never stale. Without `with_results`,
+    a stored job's results aren't loaded (they may be unset).
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        load = job_store.load if with_results else job_store.get_status
+        job = await executor.run_io(load, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def etag_response(request: Request, etag: str, build) -> Response:
+    """
+    Answer 304 when the client's ETag matches, else the JSON from `build()`.
+
+    `build` is only called on a miss, so unchanged polls skip serializing
+    the payload entirely.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
+
+def process_owner() -> str:
+    """Identify this process as the owner of the inline jobs it runs."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_alive(owner: str, updated_at: float) -> bool:
+    """Tell whether a job's owner process may still be running it."""
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return time.time() - updated_at < JOB_OWNER_STALE_SECONDS
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+async def resume_interrupted_jobs():
+    """
+    Restart the pending/processing jobs in the store from their checkpoints.
+
+    Each API worker process calls this on startup; a job is resumed only by
+    the one that claims it, and never while its owner is still running it.
+    """
+    owner = process_owner()
+    for job_id, checkpointed in await executor.run_io(job_store.interrupted):
+        if not await executor.run_io(job_store.claim, job_id, owner, owner_alive):
+            continue
+        job = await executor.run_io(job_store.load, job_id)
+        addresses = await executor.run_io(job_store.get_addresses, job_id)
+        if job is None or not addresses:
+            continue
+
+        logger.info(f"Resuming job {job_id}: {checkpointed}/{len(addresses)} addresses already done")
+        jobs[job_id] = job
+        task = asyncio.create_task(process_job(job_id, addresses))
+        job_tasks.add(task)
+        task.add_done_callback(job_tasks.discard)
 
 
 def get_client_ip(request: Request) -> str:
@@ -129,20 +320,25 @@ def parse_csv_fallback(content: str) -> List[AddressInput]:
 
 async def process_single_address(
     address: AddressInput,
-    job_id: str
+    job_id: str,
+    image_index: Optional[ImageIndex] = None
 ) -> BuildingResult:
     """Process a single address: fetch images, search, and analyze."""
 
-    full_address = await zip_service.get_full_address(
+    state, county = await zip_service.lookup(address.zip_code)
+    full_address = zip_service.format_address(
         address.street_number,
         address.street_name,
-        address.zip_code
+        address.zip_code,
+        state,
+        county
     )
 
     logger.info(f"Processing: {full_address}")
 
     if job_id in jobs:
         jobs[job_id].current_address = full_address
+        job_events.notify(job_id)
 
     result = BuildingResult(
         street_number=address.street_number,
@@ -150,14 +346,13 @@ async def process_single_address(
         zip_code=address.zip_code
     )
 
-    state, county = await zip_service.lookup(address.zip_code)
     result.state = state
     result.county = county
 
     try:
-        image_paths = await image_service.fetch_images(full_address, num_images=4)
+        images = await image_service.fetch_images(full_address, index=image_index)
 
-        if not image_paths:
+        if not images:
             result.error = "No streetview data available"
             result.building_type = BuildingType.MISC
             result.wwr_estimate = 0
@@ -165,21 +360,46 @@ async def process_single_address(
             result.reasoning = "Could not fetch street view images for this address"
             return result
 
-        result.images_folder = image_service.get_folder_name(full_address)
+        if image_service.persist_images:
+            # Files and variants are written in the background
+            result.images_folder = image_service.get_folder_name(full_address)
+
+        images, result.image_quality = await image_service.filter_images(images)
+        if not images:
+            result.error = "No usable streetview images"
+            result.building_type = BuildingType.MISC
+            result.wwr_estimate = 0
+            result.confidence = Confidence.LOW
+            result.reasoning = "Street View returned only placeholder or unreadable frames"
+            return result
+
+        if image_index is not None:
+            result.shares_imagery_with = image_index.record_hashes(
+                full_address, [(image.phash, image.filename) for image in images]
+            ) or None
 
         search_results = await search_service.search_address(full_address)
         search_context = search_service.format_search_context(search_results)
 
         analysis = await vision_service.analyze_building(
-            image_paths=image_paths,
+            images=[image.data for image in images],
             address=full_address,
-            search_context=search_context
+            search_context=search_context,
+            options=jobs[job_id].vision_options if job_id in jobs else None,
+            labels=[f"{image.heading}deg" for image in images],
+            search_evidence=search_service.infer_building_type(search_results)
         )
 
         result.building_type = analysis.building_type
         result.wwr_estimate = analysis.wwr_estimate
         result.confidence = analysis.confidence
         result.reasoning = analysis.reasoning
+        result.token_usage = analysis.usage
+        result.escalation_reason = analysis.escalation_reason
+        result.vision_model = analysis.vision_model
+        result.vision_detail = analysis.vision_detail
+        result.facade_estimate = analysis.facade_estimate
+        result.vision_skipped = analysis.vision_skipped
 
     except Exception as e:
         logger.error(f"Error processing {full_address}: {e}")
@@ -193,18 +413,76 @@ async def process_single_address(
 
 
 async def process_job(job_id: str, addresses: List[AddressInput]):
-    """Background task to process all addresses in a job."""
+    """
+    Background task to process all addresses in a job.
+
+    Addresses run concurrently, bounded by `concurrency_limits.addresses`
+    (each service additionally caps its own upstream calls). Results are
+    published to `job.results` in input order: a finished address is only
+    appended once every address before it has finished.
+
+    Each finished address is checkpointed in the job store, and every
+    newly published result is appended to the results CSV right away.
+    Addresses that already have a checkpoint (a resumed job) are not
+    processed again.
+    """
     job = jobs[job_id]
     job.status = "processing"
+
+    # Checkpoints from before a restart; empty for a new job
+    completed: Dict[int, BuildingResult] = await executor.run_io(job_store.get_results, job_id)
+    pending = [(i, address) for i, address in enumerate(addresses) if i not in completed]
+    job.processed_addresses = len(completed)
     job.results = []
 
+    def publish() -> int:
+        # Publish the contiguous prefix of finished results, in input order
+        published = len(job.results)
+        while len(job.results) in completed:
+            job.results.append(completed.pop(len(job.results)))
+        return len(job.results) - published
+
+    publish()
+    await executor.run_io(job_store.update, job.model_copy())
+    job_events.notify(job_id)
+
+    semaphore = asyncio.Semaphore(concurrency_limits.addresses)
+    # Frames and hashes shared between this job's addresses
+    image_index = ImageIndex()
+
+    async def run(index: int, address: AddressInput):
+        async with semaphore:
+            result = await process_single_address(address, job_id, image_index)
+
+        completed[index] = result
+        job.processed_addresses += 1
+        job.image_dedup = image_index.get_stats()
+        try:
+            await executor.run_io(job_store.save_result, job_id, index, result)
+        except Exception as e:
+            # The result is still delivered; it just won't survive a restart
+            logger.error(f"Could not checkpoint result {index} of job {job_id}: {e}")
+
+        if publish():
+            job_events.notify(job_id)
+            results = list(job.results)
+            try:
+                await append_results_csv(job_id, lambda start: results[start:])
+            except Exception as e:
+                # Retried with the next result and when the job finishes
+                logger.error(f"Could not append to the results CSV of job {job_id}: {e}")
+
     try:
-        for i, address in enumerate(addresses):
-            result = await process_single_address(address, job_id)
-            job.results.append(result)
-            job.processed_addresses = i + 1
-            await asyncio.sleep(0.5)
+        # Resolve every unique ZIP once before the addresses fan out
+        await zip_service.prefetch(address.zip_code for _, address in pending)
 
+        await asyncio.gather(*(run(i, address) for i, address in pending))
+
+        # Images are persisted off the critical path; make sure this job's
+        # are on disk before it is reported complete (downloads read them)
+        await image_service.wait_background(
+            result.images_folder for result in job.results if result.images_folder
+        )
         await save_results_csv(job_id, job.results)
 
         job.status = "completed"
@@ -216,36 +494,39 @@ async def process_job(job_id: str, addresses: List[AddressInput]):
         job.status = "failed"
         job.error = str(e)
 
+    await executor.run_io(job_store.update, job.model_copy())
+    # From now on the job is read from the store
+    jobs.pop(job_id, None)
+    job_events.notify(job_id)
 
-async def save_results_csv(job_id: str, results: List[BuildingResult]):
-    """Save job results to CSV file."""
-    csv_path = OUTPUT_DIR / f"results_{job_id}.csv"
-
-    with open(csv_path, "w", newline="") as f:
-        fieldnames = [
-            "street_number", "street_name", "zip_code", "state", "county",
-            "building_type", "wwr_estimate", "confidence", "reasoning",
-            "images_folder", "error"
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
 
-        for result in results:
-            writer.writerow({
-                "street_number": result.street_number,
-                "street_name": result.street_name,
-                "zip_code": result.zip_code,
-                "state": result.state or "",
-                "county": result.county or "",
-                "building_type": result.building_type.value if result.building_type else "",
-                "wwr_estimate": result.wwr_estimate if result.wwr_estimate is not None else "",
-                "confidence": result.confidence.value if result.confidence else "",
-                "reasoning": result.reasoning or "",
-                "images_folder": result.images_folder or "",
-                "error": result.error or ""
-            })
-
-    logger.info(f"Saved results to {csv_path}")
+def results_csv(job_id: str) -> ResultsCSVWriter:
+    """The job's results CSV, appended to as results are published."""
+    return ResultsCSVWriter(OUTPUT_DIR / f"results_{job_id}.csv")
+
+
+async def append_results_csv(
+    job_id: str,
+    results_from: Callable[[int], Sequence[BuildingResult]]
+) -> int:
+    """
+    Append the job's next published results to its CSV (on the blocking executor).
+
+    Args:
+        job_id: Job ID
+        results_from: Returns the in-order results from a given index
+
+    Returns:
+        Number of result rows in the CSV
+    """
+    return await executor.run_io(results_csv(job_id).append, results_from)
+
+
+async def save_results_csv(job_id: str, results: List[BuildingResult]):
+    """Make sure the job's CSV holds every result (only missing rows are written)."""
+    results = list(results)
+    rows = await append_results_csv(job_id, lambda start: results[start:])
+    logger.info(f"Saved {rows} results to {results_csv(job_id).path}")
 
 
 # ============== API ENDPOINTS ==============
@@ -259,8 +540,11 @@ async def api_root():
         "endpoints": {
             "upload": "POST /api/upload - Upload CSV file",
             "status": "GET /api/status/{job_id} - Check job status",
-            "results": "GET /api/results/{job_id} - Download results CSV",
-            "download_zip": "GET /api/download/{job_id}/zip - Download all results as ZIP"
+            "events": "GET /api/events/{job_id} - Stream job progress and results (server-sent events)",
+            "results": "GET /api/results/{job_id} - Download results CSV (partial while processing)",
+            "download_zip": "GET /api/download/{job_id}/zip - Download all results as ZIP",
+            "images": "GET /api/images/{folder}[/{filename}?variant=thumb] - List or view street view images",
+            "stats": "GET /api/stats - Cache, quota, circuit breaker and event-loop statistics"
         }
     }
 
@@ -306,10 +590,10 @@ async def test_apis():
     # Test Google Street View
     try:
         test_address = "350 5th Avenue, New York, NY 10118"
-        paths = await image_service.fetch_images(test_address, num_images=1)
+        images = await image_service.fetch_images(test_address, num_images=1)
         results["google_streetview"] = {
-            "status": "ok" if paths else "no_images",
-            "message": f"Got {len(paths)} images" if paths else "No street view available"
+            "status": "ok" if images else "no_images",
+            "message": f"Got {len(images)} images" if images else "No street view available"
         }
     except Exception as e:
         results["google_streetview"] = {"status": "error", "message": str(e)}
@@ -351,12 +635,42 @@ async def test_apis():
     return results
 
 
+@app.get("/api/stats")
+async def get_stats():
+    """Cache, concurrency, quota, circuit breaker and event-loop statistics for monitoring."""
+    # Counts and sizes the cached images in SQLite: keep it off the event loop
+    image_cache_stats = (
+        await executor.run_io(image_service.image_cache.get_stats)
+        if image_service.image_cache else None
+    )
+    return {
+        "concurrency_limits": concurrency_limits.get_limits(),
+        "event_loop": loop_monitor.get_stats(),
+        "blocking_executor": executor.get_stats(),
+        "quotas": quota_governor.get_stats(),
+        "upstreams": resilience.get_stats(),
+        "caches": {
+            "zip": zip_service.cache.get_stats() if zip_service.cache else None,
+            "zip_table": zip_service.table.get_stats() if zip_service.table else None,
+            "streetview_images": image_cache_stats,
+            "search": search_service.cache.get_stats() if search_service.cache else None,
+            "vision": vision_service.get_cache_stats(),
+        },
+        "vision_usage": vision_service.get_usage_stats(),
+        "vision_cascade": vision_service.get_cascade_stats(),
+        "facade_analyzer": vision_service.get_facade_stats(),
+        "search_api_calls": search_service.api_calls,
+        "execution_mode": EXECUTION_MODE,
+        "task_queue": await executor.run_io(task_queue.get_stats) if EXECUTION_MODE == "queue" else None
+    }
+
+
 @app.get("/api/rate-limit")
 async def get_rate_limit(request: Request):
     """Check current rate limit status."""
     client_ip = get_client_ip(request)
-    used, remaining = rate_limiter.get_usage(client_ip)
-    reset_seconds = rate_limiter.get_reset_time(client_ip)
+    used, remaining = await executor.run_io(rate_limiter.get_usage, client_ip)
+    reset_seconds = await executor.run_io(rate_limiter.get_reset_time, client_ip)
 
     return {
         "buildings_used": used,
@@ -370,12 +684,44 @@ async def get_rate_limit(request: Request):
 async def upload_csv(
     request: Request,
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    detail: Optional[ImageDetail] = None,
+    max_size: Optional[int] = None,
+    crop: Optional[float] = None,
+    jpeg_quality: Optional[int] = None,
+    mosaic: Optional[bool] = None,
+    cascade: Optional[bool] = None
 ):
-    """Upload a CSV file with addresses to process."""
+    """
+    Upload a CSV file with addresses to process.
+
+    Optional query parameters override the vision defaults for this job:
+    `detail` (low/high/auto), `max_size` (longest side in pixels), `crop`
+    (centre fraction kept, 0-1], `jpeg_quality`, `mosaic` (send all
+    views as one tiled image) and `cascade` (cheap first pass). An explicit
+    `detail` applies to the cascade's first pass too.
+    """
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
+    overrides = {
+        "detail": detail,
+        "max_size": max_size,
+        "crop": crop,
+        "jpeg_quality": jpeg_quality,
+        "mosaic": mosaic,
+        "cascade": cascade,
+        # Analyze at the requested detail from the start, not at the cheap default
+        "first_pass_detail": detail,
+    }
+    try:
+        vision_options = VisionOptions(**{
+            **vision_service.default_options().model_dump(),
+            **{key: value for key, value in overrides.items() if value is not None}
+        })
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid vision options: {e}")
+
     content = await file.read()
     try:
         content_str = content.decode("utf-8")
@@ -400,27 +746,30 @@ async def upload_csv(
             detail="Could not parse addresses from CSV. Please ensure your file contains address information."
         )
 
-    # Check rate limit
+    # Check rate limit and record usage (atomically across API processes)
     client_ip = get_client_ip(request)
-    allowed, message = rate_limiter.check_limit(client_ip, len(addresses))
+    allowed, message = await executor.run_io(rate_limiter.consume, client_ip, len(addresses))
 
     if not allowed:
         raise HTTPException(status_code=429, detail=message)
 
-    # Record usage
-    rate_limiter.record_usage(client_ip, len(addresses))
-
     # Create job
     job_id = str(uuid.uuid4())[:8]
     job = JobStatus(
         job_id=job_id,
         status="pending",
         total_addresses=len(addresses),
-        processed_addresses=0
+        processed_addresses=0,
+        vision_options=vision_options
     )
-    jobs[job_id] = job
+    owner = None if EXECUTION_MODE == "queue" else process_owner()
+    await executor.run_io(job_store.create, job, addresses, owner)
 
-    background_tasks.add_task(process_job, job_id, addresses)
+    if EXECUTION_MODE == "queue":
+        await executor.run_io(task_queue.enqueue, job_id, len(addresses))
+    else:
+        jobs[job_id] = job
+        background_tasks.add_task(process_job, job_id, addresses)
 
     return UploadResponse(
         job_id=job_id,
@@ -429,108 +778,272 @@ async def upload_csv(
     )
 
 
-@app.get("/api/status/{job_id}", response_model=JobStatus)
-async def get_job_status(job_id: str):
-    """Get the status of a processing job."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return jobs[job_id]
+@app.get("/api/status/{job_id}", response_model=JobStatus, response_model_exclude={"results"})
+async def get_job_status(job_id: str, request: Request):
+    """
+    Get the status of a processing job, without its results.
+
+    Costs the same at any job size; fetch results incrementally from
+    /api/results/{job_id}/json?since=... (or the event stream). Supports
+    If-None-Match: an unchanged status is answered with 304.
+    """
+    job = await get_job(job_id, with_results=False)
+    payload = job.model_dump(mode="json", exclude={"results"})
+    body = json.dumps(payload, sort_keys=True).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+    return etag_response(request, etag, lambda: payload)
+
+
+def result_json(r: BuildingResult) -> dict:
+    """Serialize a result the way the JSON results and progress stream send it."""
+    return {
+        "street_number": r.street_number,
+        "street_name": r.street_name,
+        "zip_code": r.zip_code,
+        "state": r.state,
+        "county": r.county,
+        "building_type": r.building_type.value if r.building_type else None,
+        "wwr_estimate": r.wwr_estimate,
+        "confidence": r.confidence.value if r.confidence else None,
+        "reasoning": r.reasoning,
+        "images_folder": r.images_folder,
+        "token_usage": r.token_usage.model_dump() if r.token_usage else None,
+        "escalation_reason": r.escalation_reason,
+        "vision_model": r.vision_model,
+        "vision_detail": r.vision_detail.value if r.vision_detail else None,
+        "facade_estimate": r.facade_estimate.model_dump() if r.facade_estimate else None,
+        "vision_skipped": r.vision_skipped,
+        "image_quality": [d.model_dump() for d in r.image_quality] if r.image_quality else None,
+        "shares_imagery_with": r.shares_imagery_with,
+        "error": r.error
+    }
+
+
+def sse_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Format one server-sent event."""
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def read_job_progress(job_id: str, cursor: int) -> Tuple[Optional[JobStatus], List[BuildingResult]]:
+    """
+    Get a job's status and its in-order results from index `cursor` on.
+
+    Jobs running in this process are read from memory; others (finished,
+    or run by queue workers) from the job store without loading results
+    the client already has.
+    """
+    job = jobs.get(job_id)
+    if job is not None:
+        return job, list((job.results or [])[cursor:])
+    status = await executor.run_io(job_store.get_status, job_id)
+    if status is None:
+        return None, []
+    return status, await executor.run_io(job_store.get_results_since, job_id, cursor)
+
+
+async def job_event_stream(job_id: str, cursor: int) -> AsyncIterator[str]:
+    """
+    Stream a job's progress as server-sent events until it finishes.
+
+    Events: `result` (one per finished address, in input order, with the
+    address index as event ID), `progress` (status and counts, only when
+    they change) and a final `done`. Local jobs wake the stream on every
+    change; others are polled every SSE_POLL_INTERVAL seconds.
+    """
+    last_progress = None
+    last_sent = time.monotonic()
+    while True:
+        changed = job_events.changed(job_id) if job_id in jobs else None
+        job, new_results = await read_job_progress(job_id, cursor)
+        if job is None:
+            yield sse_event("done", {"status": "failed", "error": "Job not found"})
+            return
+
+        for result in new_results:
+            yield sse_event("result", {"index": cursor, "result": result_json(result)}, event_id=cursor)
+            cursor += 1
+            last_sent = time.monotonic()
+
+        progress = {
+            "job_id": job.job_id,
+            "status": job.status,
+            "total_addresses": job.total_addresses,
+            "processed_addresses": job.processed_addresses,
+            "current_address": job.current_address,
+            "error": job.error
+        }
+        if progress != last_progress:
+            yield sse_event("progress", progress)
+            last_progress = progress
+            last_sent = time.monotonic()
+
+        if job.status in ("completed", "failed"):
+            yield sse_event("done", {"status": job.status, "error": job.error, "results": cursor})
+            return
+
+        if time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+            # Comment line: keeps proxies from closing an idle connection
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+
+        if changed is not None:
+            try:
+                await asyncio.wait_for(changed.wait(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+
+
+@app.get("/api/events/{job_id}")
+async def stream_job_events(job_id: str, request: Request, since: int = 0):
+    """
+    Push a job's progress and results over one long-lived connection (SSE).
+
+    `since` skips results the client already has; a reconnecting
+    EventSource resumes after its `Last-Event-ID` instead.
+    """
+    await get_job(job_id, with_results=False)
+
+    last_event_id = request.headers.get("Last-Event-ID")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id) + 1
+
+    return StreamingResponse(
+        job_event_stream(job_id, max(0, since)),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Don't let nginx-style proxies buffer the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 @app.get("/api/results/{job_id}")
 async def get_results(job_id: str):
-    """Download the results CSV for a completed job."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    job = jobs[job_id]
-    if job.status != "completed":
+    """
+    Download the results CSV of a job.
+
+    While a job is processing (or after it failed) this is the partial CSV
+    of the results finished so far, in input order; rows still being
+    written are never included.
+    """
+    job = await get_job(job_id, with_results=False)
+    if job.status == "pending":
         raise HTTPException(
             status_code=400,
-            detail=f"Job not completed. Current status: {job.status}"
+            detail=f"Job not started. Current status: {job.status}"
+        )
+
+    writer = results_csv(job_id)
+    if not writer.path.exists():
+        if job.status == "completed":
+            raise HTTPException(status_code=404, detail="Results file not found")
+        # No result is in order yet: just the header
+        return Response(
+            ",".join(RESULTS_CSV_FIELDS) + "\r\n",
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=building_scanner_results_{job_id}_partial.csv",
+                "X-Result-Rows": "0"
+            }
         )
 
-    csv_path = OUTPUT_DIR / f"results_{job_id}.csv"
-    if not csv_path.exists():
-        raise HTTPException(status_code=404, detail="Results file not found")
+    if job.status == "completed":
+        return FileResponse(
+            path=str(writer.path),
+            media_type="text/csv",
+            filename=f"building_scanner_results_{job_id}.csv"
+        )
 
-    return FileResponse(
-        path=str(csv_path),
+    rows, _ = await executor.run_io(writer.committed)
+    return StreamingResponse(
+        writer.iter_committed(),
         media_type="text/csv",
-        filename=f"building_scanner_results_{job_id}.csv"
+        headers={
+            "Content-Disposition": f"attachment; filename=building_scanner_results_{job_id}_partial.csv",
+            "X-Result-Rows": str(rows)
+        }
     )
 
 
 @app.get("/api/results/{job_id}/json")
-async def get_results_json(job_id: str):
-    """Get the results as JSON for a completed job."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    job = jobs[job_id]
+async def get_results_json(
+    job_id: str,
+    request: Request,
+    since: int = 0,
+    limit: Optional[int] = None
+):
+    """
+    Get a job's results as JSON, incrementally.
+
+    Results are the in-order prefix of finished addresses, which never
+    changes once published. `since` is the index of the first result to
+    return (pass the previous response's `next_since`) and `limit` caps the
+    page (at most RESULTS_PAGE_MAX). A page is identified by its cursor,
+    size and the job's progress, so repeat polls get a cheap 304.
+    """
+    if since < 0 or (limit is not None and limit < 1):
+        raise HTTPException(status_code=400, detail="since must be >= 0 and limit >= 1")
+    limit = min(limit or RESULTS_PAGE_MAX, RESULTS_PAGE_MAX)
+
+    job = await get_job(job_id, with_results=False)
     if job.status not in ["completed", "processing"]:
         raise HTTPException(
             status_code=400,
             detail=f"Job not ready. Current status: {job.status}"
         )
 
-    return {
+    if job.results is not None:
+        page = job.results[since:since + limit]
+    else:
+        page = await executor.run_io(job_store.get_results_since, job_id, since, limit)
+
+    next_since = since + len(page)
+    etag = f'"{job_id}:{job.status}:{job.processed_addresses}:{since}:{len(page)}"'
+    return etag_response(request, etag, lambda: {
         "job_id": job_id,
         "status": job.status,
         "total": job.total_addresses,
         "processed": job.processed_addresses,
-        "results": [
-            {
-                "street_number": r.street_number,
-                "street_name": r.street_name,
-                "zip_code": r.zip_code,
-                "state": r.state,
-                "county": r.county,
-                "building_type": r.building_type.value if r.building_type else None,
-                "wwr_estimate": r.wwr_estimate,
-                "confidence": r.confidence.value if r.confidence else None,
-                "reasoning": r.reasoning,
-                "images_folder": r.images_folder,
-                "error": r.error
-            }
-            for r in (job.results or [])
-        ]
-    }
+        "image_dedup": job.image_dedup.model_dump() if job.image_dedup else None,
+        "since": since,
+        "next_since": next_since,
+        "has_more": next_since < job.total_addresses and job.status != "failed",
+        "results": [result_json(r) for r in page]
+    })
 
 
 @app.get("/api/download/{job_id}/zip")
 async def download_zip(job_id: str):
     """Download all results as a ZIP file with compressed images."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    job = jobs[job_id]
+    job = await get_job(job_id)
     if job.status != "completed":
         raise HTTPException(
             status_code=400,
             detail=f"Job not completed. Current status: {job.status}"
         )
 
-    # Create ZIP in memory
-    zip_buffer = BytesIO()
+    results = list(job.results or [])
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        # Add results CSV
+    def zip_entries():
+        # Results CSV
         csv_path = OUTPUT_DIR / f"results_{job_id}.csv"
         if csv_path.exists():
-            zf.write(csv_path, "results.csv")
+            yield "results.csv", csv_path, zipfile.ZIP_DEFLATED
 
-        # Add compressed images for each result
-        for result in (job.results or []):
+        # Compressed images for each result; JPEGs are stored, not deflated
+        for result in results:
             if result.images_folder:
-                images = image_service.get_compressed_images(result.images_folder)
-                for filename, image_bytes in images:
-                    zf.writestr(f"images/{result.images_folder}/{filename}", image_bytes)
-
-    zip_buffer.seek(0)
+                for filename, image_path in image_service.iter_compressed_images(result.images_folder):
+                    yield f"images/{result.images_folder}/{filename}", image_path, zipfile.ZIP_STORED
 
+    # Entries are produced and sent one at a time (the sync generator runs
+    # in Starlette's threadpool), so memory stays bounded by one chunk
     return StreamingResponse(
-        zip_buffer,
+        stream_zip(zip_entries()),
         media_type="application/zip",
         headers={
             "Content-Disposition": f"attachment; filename=building_scanner_{job_id}.zip"
@@ -538,9 +1051,47 @@ async def download_zip(job_id: str):
     )
 
 
+def _safe_path_part(value: str) -> str:
+    """Reject path components that could escape OUTPUT_DIR."""
+    if not value or value in (".", "..") or "/" in value or "\\" in value:
+        raise HTTPException(status_code=400, detail="Invalid path")
+    return value
+
+
+@app.get("/api/images/{folder}")
+async def list_images(folder: str):
+    """List a folder's images and their precomputed variants."""
+    folder = _safe_path_part(folder)
+    manifest = await executor.run_io(image_service.get_manifest, folder)
+    if not manifest:
+        raise HTTPException(status_code=404, detail="Images not found")
+    return {"folder": folder, "images": manifest}
+
+
+@app.get("/api/images/{folder}/{filename}")
+async def get_image(folder: str, filename: str, variant: Optional[str] = None):
+    """Serve a street view image, or one of its variants (download, thumb, vision)."""
+    if variant is not None and variant not in IMAGE_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"Unknown variant: {variant}")
+
+    path = await executor.run_io(
+        image_service.get_variant_path,
+        _safe_path_part(folder),
+        _safe_path_part(filename),
+        variant
+    )
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(str(path), media_type="image/jpeg")
+
+
 @app.get("/api/jobs")
 async def list_jobs():
     """List all jobs."""
+    stored = await executor.run_io(job_store.list_jobs)
+    # Running jobs are ahead of their last checkpoint
+    listed = {job.job_id: jobs.get(job.job_id, job) for job in stored}
+    listed.update(jobs)
     return {
         "jobs": [
             {
@@ -549,7 +1100,7 @@ async def list_jobs():
                 "total": job.total_addresses,
                 "processed": job.processed_addresses
             }
-            for job in jobs.values()
+            for job in listed.values()
         ]
     }
 
@@ -1,6 +1,6 @@
 """Data models for Building Scanner application."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from enum import Enum
 
@@ -22,6 +22,62 @@ class Confidence(str, Enum):
     LOW = "low"
 
 
+class ImageDetail(str, Enum):
+    """OpenAI vision `detail` level (low is a flat 85 tokens per image)."""
+    LOW = "low"
+    HIGH = "high"
+    AUTO = "auto"
+
+
+class VisionOptions(BaseModel):
+    """Per-job settings for the images sent to the vision model."""
+    detail: ImageDetail = ImageDetail.HIGH
+    max_size: int = Field(640, ge=64, le=2048)  # longest side in pixels
+    crop: float = Field(1.0, gt=0, le=1)  # fraction of width/height kept around the centre
+    jpeg_quality: Optional[int] = Field(None, ge=1, le=95)  # None keeps untouched images as-is
+    mosaic: bool = False  # tile all views into one labelled grid image (max_size per tile)
+    cascade: bool = True  # cheap first pass, escalated to the full model only when needed
+    first_pass_detail: Optional[ImageDetail] = None  # None: VISION_FIRST_PASS_DETAIL
+
+
+class TokenUsage(BaseModel):
+    """OpenAI token usage for one request."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+class FacadeEstimate(BaseModel):
+    """Local (pixel-based) window-to-wall ratio estimate for a building."""
+    wwr_estimate: int  # 0-100 percentage
+    certainty: float  # 0-1
+    facade_fraction: float  # share of the frame classified as facade
+    images: int
+    wwr_spread: Optional[float] = None  # std of the per-view WWRs in points (None: one view)
+
+
+class ImageQualityDecision(BaseModel):
+    """Quality-gate outcome for one Street View frame."""
+    filename: str
+    kept: bool
+    reason: Optional[str] = None  # why it was dropped (or "best_available:..." if kept anyway)
+    sharpness: Optional[float] = None  # variance of the Laplacian
+    entropy: Optional[float] = None  # greyscale histogram entropy, bits
+    vegetation: Optional[float] = None  # share of green-dominant pixels
+    phash: Optional[str] = None  # 64-bit perceptual hash, hex
+
+
+class ImageDedupStats(BaseModel):
+    """How much Street View imagery addresses in a job shared."""
+    frames_requested: int = 0
+    frames_fetched: int = 0
+    frames_shared: int = 0  # served from another address's fetch
+    unique_panoramas: int = 0
+    addresses_sharing_panoramas: int = 0
+    addresses_with_duplicate_imagery: int = 0  # perceptual-hash matches to an earlier address
+    dedup_ratio: float = 0.0  # frames_shared / frames_requested
+
+
 class AddressInput(BaseModel):
     """Input model for a single address."""
     street_number: str
@@ -35,6 +91,13 @@ class VisionAnalysisResult(BaseModel):
     wwr_estimate: int  # 0-100 percentage
     confidence: Confidence
     reasoning: str
+    parse_failed: bool = False  # True when the model reply was not valid JSON
+    usage: Optional[TokenUsage] = None  # None when served from cache
+    escalation_reason: Optional[str] = None  # set when the cascade's first pass was escalated
+    vision_model: Optional[str] = None  # model of the returned analysis (None: vision skipped)
+    vision_detail: Optional[ImageDetail] = None  # image detail that analysis was made at
+    facade_estimate: Optional[FacadeEstimate] = None  # local pixel-based WWR estimate
+    vision_skipped: bool = False  # True when the local estimate replaced the model call
 
 
 class BuildingResult(BaseModel):
@@ -49,6 +112,14 @@ class BuildingResult(BaseModel):
     confidence: Optional[Confidence] = None
     reasoning: Optional[str] = None
     images_folder: Optional[str] = None
+    token_usage: Optional[TokenUsage] = None
+    escalation_reason: Optional[str] = None
+    vision_model: Optional[str] = None
+    vision_detail: Optional[ImageDetail] = None
+    facade_estimate: Optional[FacadeEstimate] = None
+    vision_skipped: bool = False
+    image_quality: Optional[List[ImageQualityDecision]] = None
+    shares_imagery_with: Optional[List[str]] = None  # earlier addresses in the job with the same frames
     error: Optional[str] = None
 
 
@@ -60,6 +131,8 @@ class JobStatus(BaseModel):
     processed_addresses: int
     current_address: Optional[str] = None
     results: Optional[List[BuildingResult]] = None
+    vision_options: Optional[VisionOptions] = None
+    image_dedup: Optional[ImageDedupStats] = None
     error: Optional[str] = None
 
 
@@ -1,18 +1,55 @@
 """Services package for Building Scanner."""
 
 from services.zip_service import ZipService
+from services.zip_table import ZipTable
 from services.image_service import ImageService
+from services.image_cache import ImageCache
+from services.image_index import ImageIndex
 from services.search_service import SearchService
 from services.vision_service import VisionService
 from services.csv_parser_service import CSVParserService
 from services.rate_limiter import RateLimiter, rate_limiter
+from services.concurrency import ConcurrencyLimits, concurrency_limits
+from services.http_clients import HTTPClientPool
+from services.cache_store import SQLiteCache, LRUCache
+from services.quota_governor import QuotaGovernor, quota_governor
+from services.resilience import Resilience, CircuitOpenError, resilience
+from services.zip_stream import stream_zip
+from services.executor import BlockingExecutor, LoopLagMonitor, executor, loop_monitor
+from services.job_store import JobStore
+from services.task_queue import TaskQueue
+from services.job_events import JobEvents, job_events
+from services.results_csv import ResultsCSVWriter
 
 __all__ = [
     "ZipService",
+    "ZipTable",
     "ImageService",
+    "ImageCache",
+    "ImageIndex",
     "SearchService",
     "VisionService",
     "CSVParserService",
     "RateLimiter",
-    "rate_limiter"
+    "rate_limiter",
+    "ConcurrencyLimits",
+    "concurrency_limits",
+    "HTTPClientPool",
+    "SQLiteCache",
+    "LRUCache",
+    "QuotaGovernor",
+    "quota_governor",
+    "Resilience",
+    "CircuitOpenError",
+    "resilience",
+    "stream_zip",
+    "BlockingExecutor",
+    "LoopLagMonitor",
+    "executor",
+    "loop_monitor",
+    "JobStore",
+    "TaskQueue",
+    "JobEvents",
+    "job_events",
+    "ResultsCSVWriter"
 ]
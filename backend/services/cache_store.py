@@ -0,0 +1,164 @@
+"""Key-value caches: persistent (SQLite) and in-memory (LRU)."""
+
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """
+    JSON key-value cache with per-entry TTL, stored in a SQLite file.
+
+    Several caches can share one database file; each uses its own namespace.
+    The database runs in WAL mode so multiple processes can read and write
+    it concurrently. Methods block (a write can wait on another process's
+    lock for up to 30s); call them through the executor from async code.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        namespace: str,
+        default_ttl: Optional[float] = None
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30.0
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The cached (JSON-decoded) value, or `default`
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Seconds until the entry expires (None uses the default TTL;
+                no default means it never expires)
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries in this namespace.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (self.namespace, time.time())
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters for this cache."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class LRUCache:
+    """Small in-memory LRU cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, marking it most recently used."""
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
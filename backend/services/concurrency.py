@@ -0,0 +1,96 @@
+"""Concurrency limits for the address pipeline and outbound API calls."""
+
+import os
+import asyncio
+from typing import Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default caps (override with environment variables)
+DEFAULT_MAX_CONCURRENT_ADDRESSES = 8
+DEFAULT_MAX_CONCURRENT_STREETVIEW = 16
+DEFAULT_MAX_CONCURRENT_SEARCH = 6
+DEFAULT_MAX_CONCURRENT_ZIPPOPOTAM = 4
+DEFAULT_MAX_CONCURRENT_OPENAI = 4
+
+
+def env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Read a positive integer setting from the environment."""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return max(minimum, int(raw))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}: {raw!r}, using {default}")
+        return default
+
+
+class ConcurrencyLimits:
+    """
+    Bounded-concurrency settings shared by the job engine and services.
+
+    `addresses` caps how many addresses a single job processes at once. The
+    semaphores cap in-flight requests to each upstream across all jobs, so
+    throughput scales up to the external quotas rather than one address at
+    a time. The semaphores only bound this process; see `split()`.
+    """
+
+    def __init__(
+        self,
+        addresses: int = None,
+        streetview: int = None,
+        search: int = None,
+        zippopotam: int = None,
+        openai: int = None
+    ):
+        self.addresses = addresses or env_int(
+            "MAX_CONCURRENT_ADDRESSES", DEFAULT_MAX_CONCURRENT_ADDRESSES
+        )
+        self._limits: Dict[str, int] = {
+            "streetview": streetview or env_int(
+                "MAX_CONCURRENT_STREETVIEW", DEFAULT_MAX_CONCURRENT_STREETVIEW
+            ),
+            "search": search or env_int(
+                "MAX_CONCURRENT_SEARCH", DEFAULT_MAX_CONCURRENT_SEARCH
+            ),
+            "zippopotam": zippopotam or env_int(
+                "MAX_CONCURRENT_ZIPPOPOTAM", DEFAULT_MAX_CONCURRENT_ZIPPOPOTAM
+            ),
+            "openai": openai or env_int(
+                "MAX_CONCURRENT_OPENAI", DEFAULT_MAX_CONCURRENT_OPENAI
+            ),
+        }
+        self._create_semaphores()
+
+    def _create_semaphores(self) -> None:
+        self.streetview = asyncio.Semaphore(self._limits["streetview"])
+        self.search = asyncio.Semaphore(self._limits["search"])
+        self.zippopotam = asyncio.Semaphore(self._limits["zippopotam"])
+        self.openai = asyncio.Semaphore(self._limits["openai"])
+
+    def split(self, processes: int) -> None:
+        """
+        Give this process a 1/`processes` share of every upstream cap (at least 1).
+
+        Call before any request is made. `addresses` is left alone: it is
+        already a per-process setting.
+
+        Args:
+            processes: Number of processes sharing the caps
+        """
+        if processes <= 1:
+            return
+        self._limits = {
+            upstream: max(1, limit // processes) for upstream, limit in self._limits.items()
+        }
+        self._create_semaphores()
+
+    def get_limits(self) -> Dict[str, int]:
+        """Get the configured caps, keyed by upstream name."""
+        return {"addresses": self.addresses, **self._limits}
+
+
+# Global concurrency limits instance
+concurrency_limits = ConcurrencyLimits()
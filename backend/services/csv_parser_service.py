@@ -6,6 +6,10 @@ import logging
 from typing import List, Dict, Optional
 from openai import AsyncOpenAI
 
+from services.concurrency import concurrency_limits
+from services.quota_governor import quota_governor
+from services.resilience import OPENAI_TIMEOUT, resilience
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,7 +53,12 @@ Respond ONLY with valid JSON. No markdown, no explanation outside the JSON."""
         if self._client is None:
             api_key = self._api_key or os.getenv("OPENAI_API_KEY")
             if api_key:
-                self._client = AsyncOpenAI(api_key=api_key)
+                self._client = AsyncOpenAI(
+                    api_key=api_key,
+                    # Retries are owned by the resilience layer and quota governor
+                    max_retries=0,
+                    timeout=OPENAI_TIMEOUT
+                )
         return self._client
 
     async def parse_csv(self, csv_content: str) -> Dict:
@@ -73,14 +82,22 @@ Respond ONLY with valid JSON. No markdown, no explanation outside the JSON."""
             logger.warning(f"CSV truncated to {max_chars} characters")
 
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT},
-                    {"role": "user", "content": f"Parse this CSV and extract addresses:\n\n{csv_content}"}
-                ],
-                max_tokens=4000,
-                temperature=0.1  # Low temperature for consistent parsing
+            async def create():
+                async with concurrency_limits.openai:
+                    return await self.client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": self.SYSTEM_PROMPT},
+                            {"role": "user", "content": f"Parse this CSV and extract addresses:\n\n{csv_content}"}
+                        ],
+                        max_tokens=4000,
+                        temperature=0.1  # Low temperature for consistent parsing
+                    )
+
+            # ~4 characters per token, plus the completion budget
+            estimated_tokens = (len(self.SYSTEM_PROMPT) + len(csv_content)) // 4 + 4000
+            response = await resilience.call(
+                "openai", lambda: quota_governor.openai_call(create, estimated_tokens)
             )
 
             response_text = response.choices[0].message.content
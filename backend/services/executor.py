@@ -0,0 +1,158 @@
+"""Executors for blocking work, and an event-loop lag monitor."""
+
+import os
+import time
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from services.concurrency import env_int
+
+logger = logging.getLogger(__name__)
+
+# Worker defaults (override with environment variables)
+DEFAULT_IO_WORKERS = 16
+DEFAULT_CPU_WORKERS = os.cpu_count() or 2
+
+# Event-loop lag sampling
+LOOP_LAG_INTERVAL = 0.5  # seconds between samples
+LOOP_LAG_WARN = 0.25  # log a warning when a sample lags more than this
+
+
+class BlockingExecutor:
+    """
+    Runs disk- and CPU-bound work off the event loop.
+
+    Disk I/O always goes to a thread pool. CPU work (JPEG encoding, array
+    maths) goes to a thread pool by default, or to a process pool with
+    BLOCKING_EXECUTOR=process; functions sent there must be picklable,
+    i.e. module-level functions with plain arguments.
+    """
+
+    def __init__(self, kind: Optional[str] = None):
+        self.kind = (kind or os.getenv("BLOCKING_EXECUTOR", "thread")).lower()
+        self.io_workers = env_int("BLOCKING_IO_WORKERS", DEFAULT_IO_WORKERS)
+        self.cpu_workers = env_int("BLOCKING_CPU_WORKERS", DEFAULT_CPU_WORKERS)
+        self._io: Optional[Executor] = None
+        self._cpu: Optional[Executor] = None
+        self.io_tasks = 0
+        self.cpu_tasks = 0
+
+    @property
+    def io_pool(self) -> Executor:
+        if self._io is None:
+            self._io = ThreadPoolExecutor(self.io_workers, thread_name_prefix="blocking-io")
+        return self._io
+
+    @property
+    def cpu_pool(self) -> Executor:
+        if self._cpu is None:
+            if self.kind == "process":
+                self._cpu = ProcessPoolExecutor(self.cpu_workers)
+            else:
+                self._cpu = ThreadPoolExecutor(self.cpu_workers, thread_name_prefix="blocking-cpu")
+        return self._cpu
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking disk/file call in the I/O thread pool."""
+        self.io_tasks += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.io_pool, functools.partial(func, *args, **kwargs))
+
+    async def run_cpu(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a CPU-bound call in the CPU pool (threads or processes)."""
+        self.cpu_tasks += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.cpu_pool, functools.partial(func, *args, **kwargs))
+
+    def call_cpu(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a CPU-bound call from synchronous code that is already off the loop.
+
+        With a process pool the work is shipped to a worker process (so
+        several threads can encode in parallel without the GIL); with
+        threads it simply runs inline.
+        """
+        if self.kind != "process":
+            return func(*args, **kwargs)
+        self.cpu_tasks += 1
+        return self.cpu_pool.submit(func, *args, **kwargs).result()
+
+    def shutdown(self) -> None:
+        """Shut down both pools."""
+        for pool in (self._io, self._cpu):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._io = self._cpu = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "io_workers": self.io_workers,
+            "cpu_workers": self.cpu_workers,
+            "io_tasks": self.io_tasks,
+            "cpu_tasks": self.cpu_tasks,
+        }
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop responsiveness.
+
+    A background task sleeps for `interval` and records how much later than
+    requested it woke up. Anything blocking the loop (sync file I/O, image
+    encoding) shows up directly as lag.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, warn_threshold: float = LOOP_LAG_WARN):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.slow_samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+
+            self.samples += 1
+            self.last_lag = lag
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.warn_threshold:
+                self.slow_samples += 1
+                logger.warning(f"Event loop lag {lag * 1000:.0f}ms")
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "avg_lag_ms": round(self.total_lag / self.samples * 1000, 2) if self.samples else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "slow_samples": self.slow_samples,
+        }
+
+
+# Global instances
+executor = BlockingExecutor()
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,185 @@
+"""Local, CPU-only window-to-wall ratio estimate from Street View images."""
+
+import io
+from typing import List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+from PIL import Image
+
+from models import FacadeEstimate
+
+logger = logging.getLogger(__name__)
+
+# Images are decoded at reduced size (JPEG DCT scaling) to keep this to a few ms
+ANALYSIS_SIZE = 160
+# Bottom share of the frame treated as street/sidewalk and ignored
+GROUND_FRACTION = 0.2
+# Cell size (pixels at ANALYSIS_SIZE) for the window-structure check
+CELL_SIZE = 8
+
+# Colour thresholds on 0-1 channel values
+SKY_MIN_BRIGHTNESS = 0.55
+GLASS_MAX_BRIGHTNESS = 0.32  # dark, unlit window openings
+REFLECTION_MAX_SATURATION = 0.3  # grey/blue reflective glazing
+REFLECTION_MAX_BRIGHTNESS = 0.75
+# Gradient magnitude separating smooth regions (sky, plain wall) from edges
+EDGE_THRESHOLD = 0.08
+# A cell counts as windowed when this share of its pixels look like glass
+CELL_GLASS_MIN = 0.25
+
+# Below this share of the frame the building is too small/occluded to judge
+MIN_FACADE_FRACTION = 0.25
+# Per-image WWR spread (points) at which certainty drops to zero
+MAX_WWR_SPREAD = 20.0
+# Consistency credited to a lone view, which has nothing to agree with
+SINGLE_VIEW_CONSISTENCY = 0.5
+# Edge-profile variation (coefficient of variation) of a clear window grid
+GRID_CV = 0.6
+
+
+def _decode(data: bytes) -> np.ndarray:
+    """Decode a JPEG to a float32 RGB array near ANALYSIS_SIZE, in 0-1."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", (ANALYSIS_SIZE, ANALYSIS_SIZE))
+        img = img.convert("RGB")
+        if max(img.size) > ANALYSIS_SIZE:
+            img = img.resize((ANALYSIS_SIZE, round(ANALYSIS_SIZE * img.height / img.width)))
+        return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def _variation(edges: np.ndarray, facade: np.ndarray, axis: int) -> float:
+    """
+    Coefficient of variation of an edge profile along one axis.
+
+    Each row/column's edge count is normalized by its facade pixels, so
+    masked-out sky and street don't read as structure; 0 for a flat profile.
+    """
+    counts = facade.sum(axis=axis)
+    lines = counts >= facade.shape[axis] * 0.25
+    if lines.sum() < 2:
+        return 0.0
+    profile = edges.sum(axis=axis)[lines] / counts[lines]
+    mean = profile.mean()
+    return float(profile.std() / mean) if mean > 0 else 0.0
+
+
+def _analyze_array(rgb: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Segment one image into sky, ground, wall and glass.
+
+    Returns:
+        Tuple of (wwr 0-1, facade share of the frame, window-structure score 0-1)
+    """
+    height, width, _ = rgb.shape
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    value = rgb.max(axis=2)
+    saturation = np.where(value > 0, (value - rgb.min(axis=2)) / np.maximum(value, 1e-6), 0)
+
+    gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    gradient = np.zeros_like(gray)
+    gradient[:, 1:] += np.abs(np.diff(gray, axis=1))
+    gradient[1:, :] += np.abs(np.diff(gray, axis=0))
+    edges = gradient > EDGE_THRESHOLD
+
+    rows = np.arange(height)[:, None]
+    # Sky: bright, smooth, blue or neutral, and in the upper part of the frame
+    sky_colour = (
+        (value > SKY_MIN_BRIGHTNESS)
+        & ~edges
+        & (b >= r - 0.02)
+        & (rows < height * 0.6)
+    )
+    # ... and reaching down unbroken from the top edge, so a light wall below
+    # the roofline (or between windows) isn't mistaken for sky
+    sky = np.cumprod(sky_colour, axis=0, dtype=np.uint8).astype(bool)
+    ground = np.broadcast_to(rows >= height * (1 - GROUND_FRACTION), sky.shape)
+    facade = ~sky & ~ground
+
+    glass_colour = (value < GLASS_MAX_BRIGHTNESS) | (
+        (saturation < REFLECTION_MAX_SATURATION)
+        & (b >= g - 0.02)
+        & (value < REFLECTION_MAX_BRIGHTNESS)
+    )
+    glass = glass_colour & facade
+
+    # Per-cell statistics: windows are glass blocks bounded by edges
+    cells_y, cells_x = height // CELL_SIZE, width // CELL_SIZE
+    crop = (slice(0, cells_y * CELL_SIZE), slice(0, cells_x * CELL_SIZE))
+
+    def cell_mean(mask: np.ndarray) -> np.ndarray:
+        return mask[crop].reshape(cells_y, CELL_SIZE, cells_x, CELL_SIZE).mean(axis=(1, 3))
+
+    facade_cells = cell_mean(facade) > 0.5
+    glass_cells = cell_mean(glass)
+    edge_cells = cell_mean(edges)
+
+    facade_pixels = facade.sum()
+    if facade_pixels == 0 or not facade_cells.any():
+        return 0.0, 0.0, 0.0
+
+    # Glass that sits in cells with some edge structure (not a dark shadowed wall)
+    windowed = facade_cells & (glass_cells >= CELL_GLASS_MIN) & (edge_cells > 0.05)
+    wwr = float((glass_cells * windowed).sum() / facade_cells.sum())
+
+    # Window grids put their edges in a few rows and columns; foliage and
+    # noise spread them evenly, so an uneven edge profile means structure
+    vertical_edges = (np.abs(np.diff(gray, axis=1)) > EDGE_THRESHOLD) & facade[:, 1:]
+    horizontal_edges = (np.abs(np.diff(gray, axis=0)) > EDGE_THRESHOLD) & facade[1:, :]
+    structure = float(np.sqrt(
+        min(1.0, _variation(vertical_edges, facade[:, 1:], axis=0) / GRID_CV)
+        * min(1.0, _variation(horizontal_edges, facade[1:, :], axis=1) / GRID_CV)
+    ))
+
+    return min(wwr, 1.0), float(facade_pixels / (height * width)), structure
+
+
+def estimate_facade(images: Sequence[bytes]) -> Optional[FacadeEstimate]:
+    """
+    Estimate a building's window-to-wall ratio from its Street View images.
+
+    Vectorized colour/edge segmentation: sky and street are masked out, the
+    remaining facade is split into cells, and glass-coloured pixels count
+    toward WWR only in cells with window-like edge structure. Certainty
+    combines how much of the frame the facade fills, how consistent the
+    views are (a single view only gets SINGLE_VIEW_CONSISTENCY), and how
+    grid-like the edges are. A heuristic: good enough as an independent
+    check (or, once calibrated, a prior), not a replacement for the model
+    on unusual facades. Blocking (a few ms per image); run on the executor.
+
+    Args:
+        images: JPEG data of each view
+
+    Returns:
+        FacadeEstimate, or None if no image could be analyzed
+    """
+    per_image: List[Tuple[float, float, float]] = []
+    for data in images:
+        try:
+            per_image.append(_analyze_array(_decode(bytes(data))))
+        except Exception as e:
+            logger.warning(f"Facade analysis failed for one image: {e}")
+
+    if not per_image:
+        return None
+
+    stats = np.array(per_image)
+    wwr_values = stats[:, 0] * 100
+    facade_fraction = float(stats[:, 1].mean())
+    structure = float(stats[:, 2].mean())
+
+    coverage = min(1.0, facade_fraction / MIN_FACADE_FRACTION) if facade_fraction else 0.0
+    spread = float(wwr_values.std()) if len(per_image) > 1 else None
+    if spread is None:
+        consistency = SINGLE_VIEW_CONSISTENCY
+    else:
+        consistency = 1.0 - min(1.0, spread / MAX_WWR_SPREAD)
+    certainty = coverage * consistency * structure
+
+    return FacadeEstimate(
+        wwr_estimate=int(round(float(np.median(wwr_values)))),
+        certainty=round(certainty, 3),
+        facade_fraction=round(facade_fraction, 3),
+        images=len(per_image),
+        wwr_spread=round(spread, 1) if spread is not None else None
+    )
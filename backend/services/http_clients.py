@@ -0,0 +1,114 @@
+"""Shared, connection-pooled HTTP clients for outbound services."""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import logging
+
+import httpx
+
+from services.concurrency import env_int
+
+logger = logging.getLogger(__name__)
+
+# Upstream name -> base URL (one pooled client per upstream host)
+UPSTREAMS = {
+    "streetview": "https://maps.googleapis.com",
+    "search": "https://www.googleapis.com",
+    "zippopotam": "https://api.zippopotam.us",
+}
+
+# Pool defaults (override with environment variables)
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60  # seconds
+DEFAULT_TIMEOUT = 30.0  # seconds; individual calls may pass their own
+
+
+def _http2_enabled() -> bool:
+    """Check whether HTTP/2 was requested and the `h2` package is available."""
+    if os.getenv("HTTP2_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+class HTTPClientPool:
+    """
+    Owns one keep-alive `httpx.AsyncClient` per upstream host.
+
+    Created in the FastAPI `lifespan` hook and injected into the services so
+    every address reuses warm TCP/TLS connections instead of paying a new
+    handshake per call.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        keepalive_expiry: Optional[int] = None,
+        http2: Optional[bool] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or env_int(
+                "HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=max_keepalive or env_int(
+                "HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE
+            ),
+            keepalive_expiry=keepalive_expiry or env_int(
+                "HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY
+            ),
+        )
+        self.http2 = _http2_enabled() if http2 is None else http2
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """Get (creating on first use) the pooled client for an upstream."""
+        if upstream not in self._clients:
+            self._clients[upstream] = httpx.AsyncClient(
+                base_url=UPSTREAMS.get(upstream, ""),
+                limits=self.limits,
+                http2=self.http2,
+                timeout=DEFAULT_TIMEOUT,
+            )
+        return self._clients[upstream]
+
+    async def warm_up(self) -> None:
+        """Open a connection to every upstream so the first job skips the handshake."""
+        async def _warm(upstream: str):
+            try:
+                await self.get(upstream).head("/", timeout=5.0)
+            except httpx.HTTPError as e:
+                logger.warning(f"Warm-up request to {upstream} failed: {e}")
+
+        await asyncio.gather(*(_warm(upstream) for upstream in UPSTREAMS))
+        logger.info(f"HTTP client pool warmed up (http2={self.http2})")
+
+    async def close(self) -> None:
+        """Close all pooled clients."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+@asynccontextmanager
+async def client_session(
+    client: Optional[httpx.AsyncClient]
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield the injected pooled client, or a short-lived one if none was injected.
+
+    Lets services run standalone (scripts, tests) while using the shared pool
+    when running inside the app.
+    """
+    if client is not None:
+        yield client
+    else:
+        async with httpx.AsyncClient() as temp_client:
+            yield temp_client
@@ -0,0 +1,170 @@
+"""Content-addressed Street View image cache with LRU eviction."""
+
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default disk quota for cached images
+DEFAULT_IMAGE_CACHE_MAX_MB = 1024
+
+
+class ImageCache:
+    """
+    Disk cache of Street View images keyed by (pano ID, heading, size).
+
+    The same panorama viewed at the same heading and size always yields the
+    same image, so repeat scans of a portfolio never download it again.
+    Blobs live under `<cache_dir>/images/`, with an index table in SQLite
+    tracking size and last access for LRU eviction under `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        db_path: Union[str, Path],
+        max_bytes: Optional[int] = None
+    ):
+        self.root = Path(cache_dir) / "images"
+        self.root.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            max_mb = int(os.getenv("IMAGE_CACHE_MAX_MB", DEFAULT_IMAGE_CACHE_MAX_MB))
+            max_bytes = max_mb * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30.0)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS image_cache (
+                    key TEXT PRIMARY KEY,
+                    bytes INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS image_cache_lru ON image_cache (last_access)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(pano_id: str, heading: float, size: str) -> str:
+        """Build the content key for a panorama view."""
+        return hashlib.sha256(f"{pano_id}|{heading:g}|{size}".encode()).hexdigest()
+
+    def _blob_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.jpg"
+
+    def get(self, pano_id: str, heading: float, size: str) -> Optional[bytes]:
+        """
+        Get a cached image.
+
+        Args:
+            pano_id: Street View panorama ID
+            heading: Camera heading in degrees
+            size: Image size in WxH format
+
+        Returns:
+            JPEG bytes, or None on a miss
+        """
+        key = self.make_key(pano_id, heading, size)
+        path = self._blob_path(key)
+
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._conn.execute("DELETE FROM image_cache WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE image_cache SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+        self.hits += 1
+        return data
+
+    def put(self, pano_id: str, heading: float, size: str, data: bytes) -> None:
+        """
+        Store an image, evicting least-recently-used entries if over quota.
+
+        Args:
+            pano_id: Street View panorama ID
+            heading: Camera heading in degrees
+            size: Image size in WxH format
+            data: JPEG bytes
+        """
+        key = self.make_key(pano_id, heading, size)
+        path = self._blob_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_cache (key, bytes, last_access) VALUES (?, ?, ?)",
+                (key, len(data), time.time())
+            )
+            self._conn.commit()
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least-recently-used images until the cache fits its quota."""
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(bytes), 0) FROM image_cache"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            rows = self._conn.execute(
+                "SELECT key, bytes FROM image_cache ORDER BY last_access ASC"
+            ).fetchall()
+            removed = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._blob_path(key).unlink(missing_ok=True)
+                total -= size
+                removed.append((key,))
+
+            self._conn.executemany("DELETE FROM image_cache WHERE key = ?", removed)
+            self._conn.commit()
+
+        self.evictions += len(removed)
+        logger.info(f"Image cache evicted {len(removed)} images")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache counters and current disk usage."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM image_cache"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "images": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
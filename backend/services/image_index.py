@@ -0,0 +1,133 @@
+"""Job-level index of fetched Street View frames, for sharing imagery between addresses."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from models import ImageDedupStats
+from services.image_quality import hamming, PHASH_DUPLICATE_DISTANCE
+
+logger = logging.getLogger(__name__)
+
+# Frames on the same panorama within this many degrees are treated as one
+HEADING_SHARE_TOLERANCE = 5
+
+
+class ImageIndex:
+    """
+    Tracks the frames and perceptual hashes fetched during one job.
+
+    Neighbouring addresses in dense blocks often resolve to the same
+    panorama and nearly the same heading. `frame()` makes every
+    (pano, heading, size) frame a single-flight fetch, and a later address
+    whose heading is within HEADING_SHARE_TOLERANCE reuses it. `record_hashes()`
+    then finds addresses whose kept frames are perceptually identical even
+    when they came from different panoramas.
+    """
+
+    def __init__(self):
+        # (pano_id, size) -> [(heading, future of the fetched image)]
+        self._frames: Dict[Tuple[str, str], List[Tuple[int, asyncio.Future]]] = {}
+        # address -> [(phash, filename)] of its kept frames
+        self._hashes: Dict[str, List[Tuple[int, str]]] = {}
+        self._pano_addresses: Dict[str, Set[str]] = {}
+        self.frames_requested = 0
+        self.frames_fetched = 0
+        self.frames_shared = 0
+        self.perceptual_matches = 0
+
+    async def frame(
+        self,
+        pano_id: Optional[str],
+        heading: int,
+        size: str,
+        address: str,
+        fetch: Callable[[int], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Get a frame, fetching it only if no address in the job already has.
+
+        Args:
+            pano_id: Panorama ID (None disables sharing for this frame)
+            heading: Planned camera heading in degrees
+            size: Image size in WxH format
+            address: Requesting address (for pano sharing stats)
+            fetch: Coroutine function fetching the frame at a given heading
+
+        Returns:
+            Tuple of (frame, shared) where `shared` is True when another
+            address's fetch was reused
+        """
+        self.frames_requested += 1
+        if not pano_id:
+            self.frames_fetched += 1
+            return await fetch(heading), False
+
+        self._pano_addresses.setdefault(pano_id, set()).add(address)
+        entries = self._frames.setdefault((pano_id, size), [])
+        for existing_heading, future in entries:
+            distance = abs((existing_heading - heading + 180) % 360 - 180)
+            if distance <= HEADING_SHARE_TOLERANCE:
+                # shield: a cancelled waiter must not cancel the shared fetch
+                result = await asyncio.shield(future)
+                self.frames_shared += 1
+                return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (heading, future)
+        entries.append(entry)
+        self.frames_fetched += 1
+        try:
+            result = await fetch(heading)
+        except BaseException as e:
+            # Let a later address retry instead of inheriting the failure
+            entries.remove(entry)
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # mark retrieved; waiters re-raise it
+            else:
+                future.cancel()
+            raise
+        future.set_result(result)
+        return result, False
+
+    def record_hashes(self, address: str, hashes: List[Tuple[str, str]]) -> List[str]:
+        """
+        Register an address's kept frames and find earlier addresses with the same imagery.
+
+        Args:
+            address: Full address
+            hashes: (phash hex, filename) of each kept frame
+
+        Returns:
+            Earlier addresses with at least one perceptually identical frame
+        """
+        values = [(int(value, 16), filename) for value, filename in hashes if value]
+        matches = []
+        for other_address, other_values in self._hashes.items():
+            if other_address == address:
+                continue
+            if any(
+                hamming(value, other) <= PHASH_DUPLICATE_DISTANCE
+                for value, _ in values for other, _ in other_values
+            ):
+                matches.append(other_address)
+        if matches:
+            self.perceptual_matches += 1
+        self._hashes[address] = values
+        return matches
+
+    def get_stats(self) -> ImageDedupStats:
+        """Get the job's frame sharing counts and dedup ratio."""
+        return ImageDedupStats(
+            frames_requested=self.frames_requested,
+            frames_fetched=self.frames_fetched,
+            frames_shared=self.frames_shared,
+            unique_panoramas=len(self._pano_addresses),
+            addresses_sharing_panoramas=sum(
+                len(addresses) for addresses in self._pano_addresses.values() if len(addresses) > 1
+            ),
+            addresses_with_duplicate_imagery=self.perceptual_matches,
+            dedup_ratio=round(self.frames_shared / self.frames_requested, 3)
+            if self.frames_requested else 0.0
+        )
@@ -0,0 +1,179 @@
+"""Fast local quality checks and perceptual hashing for Street View frames."""
+
+import io
+from typing import List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+from PIL import Image
+
+from models import ImageQualityDecision
+
+logger = logging.getLogger(__name__)
+
+# Frames are decoded at reduced size (JPEG DCT scaling) before any check
+QUALITY_SIZE = 128
+# pHash: DCT of a 32x32 greyscale thumbnail, low 8x8 frequencies kept
+PHASH_SIZE = 32
+PHASH_LOW = 8
+
+# Thresholds (greyscale values 0-255)
+MIN_SHARPNESS = 30.0  # variance of the Laplacian; below this the frame is blurred
+MIN_ENTROPY = 3.5  # bits; sky-, road- or wall-only frames are flat
+MAX_VEGETATION = 0.6  # share of green-dominant pixels (trees, hedges)
+PLACEHOLDER_MAX_SATURATION = 8  # max-min channel spread of a grey pixel
+PLACEHOLDER_MIN_SHARE = 0.9  # share of near-identical grey pixels
+PLACEHOLDER_TOLERANCE = 6  # grey-level distance from the dominant grey
+# Google's "no imagery" grey is ~228; other flat greys (walls, shadow) are real frames
+PLACEHOLDER_GREY_MIN = 220
+PLACEHOLDER_GREY_MAX = 236
+# Hamming distance (of 64 bits) at or below which two frames are duplicates
+PHASH_DUPLICATE_DISTANCE = 8
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so a 2-D DCT is two matrix products."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    basis[0] /= np.sqrt(2)
+    return basis.astype(np.float32)
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def phash(gray: np.ndarray) -> int:
+    """64-bit perceptual hash of a greyscale array (DCT low frequencies vs median)."""
+    thumb = np.asarray(
+        Image.fromarray(gray.astype(np.uint8)).resize((PHASH_SIZE, PHASH_SIZE), Image.BILINEAR),
+        dtype=np.float32
+    )
+    low = (_DCT @ thumb @ _DCT.T)[:PHASH_LOW, :PHASH_LOW].ravel()
+    bits = low > np.median(low[1:])  # skip the DC term when picking the split
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def _decode(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", (QUALITY_SIZE, QUALITY_SIZE))
+        img = img.convert("RGB")
+        if max(img.size) > QUALITY_SIZE:
+            img = img.resize((QUALITY_SIZE, QUALITY_SIZE))
+        return np.asarray(img, dtype=np.int16)
+
+
+def assess_image(data: bytes, name: str = "") -> ImageQualityDecision:
+    """
+    Score one frame (blur, entropy, vegetation, placeholder) and hash it.
+
+    Args:
+        data: JPEG data
+        name: Filename recorded in the decision
+
+    Returns:
+        ImageQualityDecision with `kept` and `reason` set from the checks
+        (duplicates are decided across frames by `assess_images`)
+    """
+    rgb = _decode(data)
+    gray = (rgb @ np.array([299, 587, 114], dtype=np.int32)) // 1000
+    spread = rgb.max(axis=2) - rgb.min(axis=2)
+
+    # Google's "no imagery" frame is flat light grey (with a little text)
+    grey = spread <= PLACEHOLDER_MAX_SATURATION
+    dominant = np.bincount(gray[grey].ravel(), minlength=256).argmax() if grey.any() else 0
+    placeholder_share = float(
+        (grey & (np.abs(gray - dominant) <= PLACEHOLDER_TOLERANCE)).mean()
+    ) if PLACEHOLDER_GREY_MIN <= dominant <= PLACEHOLDER_GREY_MAX else 0.0
+
+    laplacian = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4 * gray[1:-1, 1:-1]
+    )
+    sharpness = float(laplacian.var())
+
+    histogram = np.bincount(gray.ravel(), minlength=256) / gray.size
+    nonzero = histogram[histogram > 0]
+    entropy = float(-(nonzero * np.log2(nonzero)).sum())
+
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    vegetation = float(((g > r + 10) & (g > b + 10)).mean())
+
+    reason: Optional[str] = None
+    if placeholder_share >= PLACEHOLDER_MIN_SHARE:
+        reason = "placeholder"
+    elif entropy < MIN_ENTROPY:
+        reason = "low_detail"
+    elif sharpness < MIN_SHARPNESS:
+        reason = "blurry"
+    elif vegetation > MAX_VEGETATION:
+        reason = "vegetation"
+
+    return ImageQualityDecision(
+        filename=name,
+        kept=reason is None,
+        reason=reason,
+        sharpness=round(sharpness, 1),
+        entropy=round(entropy, 2),
+        vegetation=round(vegetation, 3),
+        phash=f"{phash(gray):016x}"
+    )
+
+
+def assess_images(
+    images: Sequence[bytes],
+    names: Optional[Sequence[str]] = None
+) -> List[ImageQualityDecision]:
+    """
+    Decide which of a building's frames are worth sending to the model.
+
+    Frames failing a quality check are dropped, then frames whose pHash is
+    within PHASH_DUPLICATE_DISTANCE of an already kept frame. If only
+    non-placeholder frames failed, the sharpest one is kept anyway so the
+    building can still be analyzed. Blocking (a few ms per frame); run on
+    the executor.
+
+    Args:
+        images: JPEG data of each frame
+        names: Filenames recorded in the decisions
+
+    Returns:
+        One decision per frame, in order
+    """
+    names = names or [""] * len(images)
+    decisions = []
+    for data, name in zip(images, names):
+        try:
+            decisions.append(assess_image(bytes(data), name))
+        except Exception as e:
+            logger.warning(f"Quality check failed for {name}: {e}")
+            decisions.append(ImageQualityDecision(filename=name, kept=False, reason="unreadable"))
+
+    kept: List[Tuple[str, int]] = []
+    for decision in decisions:
+        if not decision.kept:
+            continue
+        value = int(decision.phash, 16)
+        duplicate = next(
+            (name for name, other in kept if hamming(value, other) <= PHASH_DUPLICATE_DISTANCE),
+            None
+        )
+        if duplicate is not None:
+            decision.kept = False
+            decision.reason = f"duplicate_of:{duplicate}"
+        else:
+            kept.append((decision.filename, value))
+
+    if not any(d.kept for d in decisions):
+        fallback = [d for d in decisions if d.reason not in ("placeholder", "unreadable")]
+        if fallback:
+            best = max(fallback, key=lambda d: d.sharpness or 0)
+            best.kept = True
+            best.reason = f"best_available:{best.reason}"
+
+    return decisions
@@ -2,29 +2,165 @@
 
 import os
 import io
+import json
+import math
 import httpx
 import asyncio
+import threading
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import logging
 from PIL import Image
 
+from models import ImageQualityDecision
+
+from services.concurrency import concurrency_limits
+from services.cache_store import SQLiteCache
+from services.executor import executor
+from services.http_clients import client_session
+from services.image_cache import ImageCache
+from services.image_index import ImageIndex
+from services.image_quality import assess_images
+from services.quota_governor import quota_governor
+from services.resilience import TRANSIENT_ERRORS, CircuitOpenError, raise_for_transient, resilience
+
 logger = logging.getLogger(__name__)
 
 # JPEG compression quality for downloads (0-100, 65 is good balance)
 COMPRESS_QUALITY = 65
 
+# Precomputed renditions stored in <folder>/variants/ (max_size: longest side)
+VARIANTS_DIR = "variants"
+IMAGE_VARIANTS = {
+    "download": {"quality": COMPRESS_QUALITY, "max_size": None},
+    "thumb": {"quality": 70, "max_size": 256},
+    "vision": {"quality": 85, "max_size": 512},
+}
+
+# Street View metadata cache lifetimes in seconds
+METADATA_CACHE_TTL = 30 * 24 * 3600
+METADATA_NEGATIVE_TTL = 7 * 24 * 3600  # ZERO_RESULTS addresses
+
+# Images fetched per building when the facade heading can be computed
+DEFAULT_IMAGES_PER_BUILDING = 2
+# Degrees between facade images when fetching more than one
+FACADE_HEADING_SPREAD = 25
+# Below this camera-to-building distance the bearing is meaningless (meters)
+MIN_HEADING_DISTANCE_M = 3.0
+
+
+@dataclass
+class StreetViewImage:
+    """A fetched Street View image, held in memory."""
+
+    filename: str
+    heading: int
+    data: bytes
+    # Where the image is (or will be) written; None when persistence is off
+    path: Optional[Path] = None
+    # Perceptual hash (hex), set by the quality gate
+    phash: Optional[str] = None
+
+
+def compute_heading(
+    from_lat: float,
+    from_lng: float,
+    to_lat: float,
+    to_lng: float
+) -> float:
+    """Initial great-circle bearing from one point to another (degrees from north)."""
+    phi1, phi2 = math.radians(from_lat), math.radians(to_lat)
+    dlng = math.radians(to_lng - from_lng)
+    x = math.sin(dlng) * math.cos(phi2)
+    y = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlng)
+    return (math.degrees(math.atan2(x, y)) + 360) % 360
+
+
+def distance_m(
+    lat1: float,
+    lng1: float,
+    lat2: float,
+    lng2: float
+) -> float:
+    """Approximate distance in meters between two nearby points."""
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return math.hypot(x, y) * 6371000
+
+
+def compress_image_file(
+    image_path: str,
+    quality: int = COMPRESS_QUALITY,
+    max_size: Optional[int] = None
+) -> bytes:
+    """
+    Compress an image to JPEG with specified quality.
+
+    Module-level so it can run in a process pool (see services.executor).
+
+    Args:
+        image_path: Path to the image file
+        quality: JPEG quality (0-100)
+        max_size: Optional longest-side limit in pixels (downscales)
+
+    Returns:
+        Compressed image as bytes
+    """
+    try:
+        with Image.open(image_path) as img:
+            # Convert to RGB if necessary (for PNG with alpha)
+            if img.mode in ('RGBA', 'P'):
+                img = img.convert('RGB')
+
+            if max_size and max(img.size) > max_size:
+                img.thumbnail((max_size, max_size))
+
+            # Compress to JPEG
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=quality, optimize=True)
+            return buffer.getvalue()
+    except Exception as e:
+        logger.error(f"Error compressing image {image_path}: {e}")
+        # Return original file content as fallback
+        with open(image_path, 'rb') as f:
+            return f.read()
+
 
 class ImageService:
     """Service to fetch street-level images from Google Street View Static API."""
 
     BASE_URL = "https://maps.googleapis.com/maps/api/streetview"
     METADATA_URL = "https://maps.googleapis.com/maps/api/streetview/metadata"
+    GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
-    # Headings for different angles (degrees from north)
+    # Fallback headings when the building location is unknown (degrees from north)
     HEADINGS = [0, 90, 180, 270]
 
-    def __init__(self, api_key: Optional[str] = None, output_dir: str = "output"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        output_dir: str = "output",
+        http_client: Optional[httpx.AsyncClient] = None,
+        image_cache: Optional[ImageCache] = None,
+        metadata_cache: Optional[SQLiteCache] = None
+    ):
+        # Pooled client injected at startup; falls back to a per-call client
+        self.http_client = http_client
+        # Persistent caches shared across jobs (optional)
+        self.image_cache = image_cache
+        self.metadata_cache = metadata_cache
+        self._geocoding_enabled = True
+        # Disk writes, image cache puts and variant builds running off the
+        # request path, by the address folder they belong to
+        self._background_tasks: Dict[str, Set[asyncio.Future]] = {}
+        # Write images to output_dir (downloads, image viewer); off = memory only
+        self.persist_images = os.getenv("PERSIST_IMAGES", "true").lower() in ("1", "true", "yes")
+        # Drop placeholder/blurred/flat/duplicate frames before analysis
+        self.quality_gate = os.getenv("IMAGE_QUALITY_GATE", "true").lower() in ("1", "true", "yes")
+        self.images_per_building = int(
+            os.getenv("STREETVIEW_IMAGES_PER_BUILDING", DEFAULT_IMAGES_PER_BUILDING)
+        )
         self.api_key = api_key or os.getenv("GOOGLE_MAPS_API_KEY")
         if not self.api_key:
             logger.warning("Google Maps API key not configured")
@@ -39,25 +175,131 @@ class ImageService:
         safe_name = "".join(c for c in safe_name if c.isalnum() or c in "_-")
         return safe_name[:100]  # Limit length
 
-    async def check_streetview_availability(self, address: str) -> bool:
+    async def _get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Dict,
+        timeout: float
+    ) -> httpx.Response:
         """
-        Check if Street View imagery is available for an address.
+        GET a Maps endpoint under the Street View quota and concurrency cap.
+
+        Timeouts, connection errors and 5xx responses are retried with
+        backoff; while the upstream is unhealthy its circuit breaker fails
+        calls fast with CircuitOpenError.
+        """
+        async def send() -> httpx.Response:
+            async with concurrency_limits.streetview:
+                response = await client.get(url, params=params, timeout=timeout)
+            return raise_for_transient(response)
+
+        return await resilience.call(
+            "streetview", lambda: quota_governor.request("streetview", send)
+        )
+
+    async def geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        """
+        Geocode an address to the building's coordinates.
+
+        This is the only request that sends the address string to Google;
+        metadata and images are then requested by coordinates and pano ID.
 
         Args:
             address: Full address string
 
         Returns:
-            True if imagery is available, False otherwise
+            Tuple of (lat, lng), or None if geocoding is unavailable
+        """
+        if not self.api_key or not self._geocoding_enabled:
+            return None
+
+        cache_key = f"geocode|{address}"
+        if self.metadata_cache is not None:
+            cached = await executor.run_io(self.metadata_cache.get, cache_key)
+            if cached is not None:
+                return tuple(cached) if cached else None
+
+        try:
+            async with client_session(self.http_client) as client:
+                response = await self._get(
+                    client,
+                    self.GEOCODE_URL,
+                    params={
+                        "address": address,
+                        "key": self.api_key
+                    },
+                    timeout=10.0
+                )
+
+            if response.status_code != 200:
+                logger.warning(f"Geocoding failed for {address}: {response.status_code}")
+                return None
+
+            data = response.json()
+            status = data.get("status")
+            if status == "OK" and data.get("results"):
+                location = data["results"][0]["geometry"]["location"]
+                coords = (location["lat"], location["lng"])
+                if self.metadata_cache is not None:
+                    await executor.run_io(
+                        self.metadata_cache.set, cache_key, list(coords), ttl=METADATA_CACHE_TTL
+                    )
+                return coords
+
+            if status == "ZERO_RESULTS" and self.metadata_cache is not None:
+                await executor.run_io(self.metadata_cache.set, cache_key, [], ttl=METADATA_NEGATIVE_TTL)
+            elif status == "REQUEST_DENIED":
+                # Geocoding API not enabled for this key; stop asking
+                logger.warning("Geocoding API denied, falling back to fixed headings")
+                self._geocoding_enabled = False
+            else:
+                logger.warning(f"Geocoding unavailable for {address}: {status}")
+            return None
+
+        except Exception as e:
+            logger.error(f"Error geocoding {address}: {e}")
+            return None
+
+    async def get_streetview_metadata(
+        self,
+        address: str,
+        location: Optional[Tuple[float, float]] = None
+    ) -> Optional[Dict]:
+        """
+        Get Street View metadata (status, pano_id, location) for an address.
+
+        Responses are cached: found panoramas for METADATA_CACHE_TTL and
+        `ZERO_RESULTS` addresses for METADATA_NEGATIVE_TTL, so addresses with
+        no imagery are not re-checked on every scan.
+
+        Args:
+            address: Full address string (cache key, and the query when no
+                coordinates are given)
+            location: Geocoded (lat, lng) of the building, used as the query
+
+        Returns:
+            Metadata dict, or None if the request failed
+
+        Raises:
+            CircuitOpenError: Street View is failing; retried errors are
+                re-raised too so outages aren't reported as "no imagery"
         """
         if not self.api_key:
-            return False
+            return None
+
+        if self.metadata_cache is not None:
+            cached = await executor.run_io(self.metadata_cache.get, address)
+            if cached is not None:
+                return cached
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
+            async with client_session(self.http_client) as client:
+                response = await self._get(
+                    client,
                     self.METADATA_URL,
                     params={
-                        "location": address,
+                        "location": f"{location[0]},{location[1]}" if location else address,
                         "key": self.api_key
                     },
                     timeout=10.0
@@ -65,66 +307,210 @@ class ImageService:
 
                 if response.status_code == 200:
                     data = response.json()
-                    return data.get("status") == "OK"
-                return False
-
+                    status = data.get("status")
+                    if self.metadata_cache is not None:
+                        if status == "OK":
+                            await executor.run_io(
+                                self.metadata_cache.set, address, data, ttl=METADATA_CACHE_TTL
+                            )
+                        elif status == "ZERO_RESULTS":
+                            await executor.run_io(
+                                self.metadata_cache.set, address, data, ttl=METADATA_NEGATIVE_TTL
+                            )
+                    return data
+                return None
+
+        except (CircuitOpenError, *TRANSIENT_ERRORS):
+            # Outage, not missing coverage: let the caller record an error
+            raise
         except Exception as e:
             logger.error(f"Error checking Street View availability: {e}")
-            return False
+            return None
+
+    async def check_streetview_availability(self, address: str) -> bool:
+        """
+        Check if Street View imagery is available for an address.
+
+        Args:
+            address: Full address string
+
+        Returns:
+            True if imagery is available, False otherwise
+        """
+        metadata = await self.get_streetview_metadata(address)
+        return bool(metadata) and metadata.get("status") == "OK"
 
     async def fetch_images(
         self,
         address: str,
-        num_images: int = 4,
-        size: str = "640x640"
-    ) -> List[str]:
+        num_images: Optional[int] = None,
+        size: str = "640x640",
+        index: Optional[ImageIndex] = None
+    ) -> List[StreetViewImage]:
         """
-        Fetch street-level images for an address from multiple angles.
+        Fetch street-level images of an address's facade.
+
+        The address is geocoded once; the nearest panorama is then looked up
+        by coordinates and images are fetched by pano ID, aimed from the
+        camera toward the building. If the building location is unknown the
+        fixed HEADINGS are used instead.
+
+        Images are returned in memory. When `persist_images` is on they are
+        also written to the address folder in the background (followed by
+        their variants); use `wait_background()` with the address's folder
+        name to wait for that.
+
+        With a job `index`, frames another address in the job already
+        fetched (same panorama, heading within tolerance) are reused
+        instead of fetched again.
 
         Args:
             address: Full address string
-            num_images: Number of images to fetch (max 4 for different angles)
+            num_images: Number of images to fetch when the facade bearing
+                is known (defaults to STREETVIEW_IMAGES_PER_BUILDING);
+                otherwise all four fixed headings are fetched
             size: Image size in WxH format
+            index: Job-level frame index shared by the job's addresses
 
         Returns:
-            List of local file paths to saved images
+            List of fetched images (empty when there is no imagery)
+
+        Raises:
+            CircuitOpenError: Street View is failing (as does any error once
+                every frame of an existing panorama failed to fetch)
         """
         if not self.api_key:
             logger.error("Google Maps API key not configured")
             return []
 
-        # Create folder for this address
-        folder_name = self._sanitize_folder_name(address)
-        address_dir = self.output_dir / folder_name
-        address_dir.mkdir(parents=True, exist_ok=True)
+        num_images = num_images or self.images_per_building
 
         # Check availability first
-        available = await self.check_streetview_availability(address)
-        if not available:
+        building_location = await self.geocode(address)
+        metadata = await self.get_streetview_metadata(address, building_location)
+        if not metadata or metadata.get("status") != "OK":
             logger.warning(f"No Street View data available for: {address}")
             return []
 
-        saved_paths: List[str] = []
-        headings = self.HEADINGS[:num_images]
+        folder_name = self._sanitize_folder_name(address)
+        address_dir = self.output_dir / folder_name if self.persist_images else None
 
-        async with httpx.AsyncClient() as client:
-            tasks = []
-            for i, heading in enumerate(headings):
-                tasks.append(
-                    self._fetch_single_image(
-                        client, address, heading, size, address_dir, i
+        pano_id = metadata.get("pano_id")
+        images: List[StreetViewImage] = []
+        headings = self._plan_headings(metadata, building_location, num_images)
+
+        async with client_session(self.http_client) as client:
+            async def fetch_frame(i: int, heading: int) -> StreetViewImage:
+                async def fetch(heading: int) -> StreetViewImage:
+                    return await self._fetch_single_image(
+                        client, address, heading, size, address_dir, i, pano_id
                     )
+
+                if index is None:
+                    return await fetch(heading)
+
+                image, shared = await index.frame(pano_id, heading, size, address, fetch)
+                if not shared:
+                    return image
+                # Same bytes, this address's own filename and folder
+                filename = f"streetview_{i}_{image.heading}deg.jpg"
+                return replace(
+                    image,
+                    filename=filename,
+                    path=address_dir / filename if address_dir is not None else None
                 )
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(
+                *(fetch_frame(i, heading) for i, heading in enumerate(headings)),
+                return_exceptions=True
+            )
 
+            errors = []
             for result in results:
-                if isinstance(result, str):
-                    saved_paths.append(result)
+                if isinstance(result, StreetViewImage):
+                    images.append(result)
                 elif isinstance(result, Exception):
                     logger.error(f"Error fetching image: {result}")
+                    errors.append(result)
+
+        if not images and errors:
+            # The panorama exists, so this is a failure rather than "no imagery";
+            # prefer an outage error (open breaker, exhausted retries) as the cause
+            outages = [e for e in errors if isinstance(e, (CircuitOpenError, *TRANSIENT_ERRORS))]
+            raise (outages or errors)[0]
 
-        return saved_paths
+        if images and address_dir is not None:
+            self._spawn(folder_name, self._persist(folder_name, images))
+
+        return images
+
+    async def filter_images(
+        self,
+        images: List[StreetViewImage]
+    ) -> Tuple[List[StreetViewImage], List[ImageQualityDecision]]:
+        """
+        Run the quality gate over a building's frames.
+
+        Placeholder, blurred, flat (sky/road/wall) and vegetation-dominated
+        frames are dropped, as are near-duplicates by perceptual hash. All
+        frames stay on disk; only the analysis input shrinks.
+
+        Args:
+            images: Fetched images
+
+        Returns:
+            Tuple of (kept images, one decision per fetched image)
+        """
+        if not self.quality_gate or not images:
+            return images, []
+
+        decisions = await executor.run_cpu(
+            assess_images,
+            [image.data for image in images],
+            [image.filename for image in images]
+        )
+        kept = []
+        for image, decision in zip(images, decisions):
+            image.phash = decision.phash
+            if decision.kept:
+                kept.append(image)
+            else:
+                logger.info(f"Quality gate dropped {image.filename}: {decision.reason}")
+        return kept, decisions
+
+    def _plan_headings(
+        self,
+        metadata: Dict,
+        building_location: Optional[Tuple[float, float]],
+        num_images: int
+    ) -> List[int]:
+        """
+        Choose camera headings for a building.
+
+        Args:
+            metadata: Street View metadata (provides the camera location)
+            building_location: Geocoded (lat, lng) of the building, if known
+            num_images: Number of images wanted around a known bearing
+
+        Returns:
+            List of integer headings in degrees
+        """
+        camera = metadata.get("location") or {}
+        if (
+            building_location
+            and "lat" in camera and "lng" in camera
+            and distance_m(camera["lat"], camera["lng"], *building_location) >= MIN_HEADING_DISTANCE_M
+        ):
+            bearing = compute_heading(camera["lat"], camera["lng"], *building_location)
+            # Spread extra images evenly around the facade bearing
+            offsets = [
+                FACADE_HEADING_SPREAD * (i - (num_images - 1) / 2)
+                for i in range(num_images)
+            ]
+            return [round(bearing + offset) % 360 for offset in offsets]
+
+        # Unknown bearing: the facade may face any way, so look all around
+        return list(self.HEADINGS)
 
     async def _fetch_single_image(
         self,
@@ -132,53 +518,131 @@ class ImageService:
         address: str,
         heading: int,
         size: str,
-        output_dir: Path,
-        index: int
-    ) -> str:
+        output_dir: Optional[Path],
+        index: int,
+        pano_id: Optional[str] = None
+    ) -> StreetViewImage:
         """
-        Fetch a single Street View image.
+        Fetch a single Street View image, from the image cache when possible.
 
         Args:
             client: HTTP client
             address: Full address string
             heading: Camera heading in degrees
             size: Image size
-            output_dir: Directory to save image
+            output_dir: Directory the image will be saved to (None: not saved)
             index: Image index for filename
+            pano_id: Panorama ID from the metadata response (cache key and
+                request target; falls back to the address when missing)
 
         Returns:
-            Path to saved image file
+            The fetched image
         """
+        filename = f"streetview_{index}_{heading}deg.jpg"
+        filepath = output_dir / filename if output_dir is not None else None
+
+        if pano_id and self.image_cache is not None:
+            cached = await executor.run_io(self.image_cache.get, pano_id, heading, size)
+            if cached is not None:
+                logger.info(f"Image cache hit: {address} heading {heading}")
+                return StreetViewImage(filename, heading, cached, filepath)
+
         params = {
-            "location": address,
             "size": size,
             "heading": heading,
             "pitch": 10,  # Slight upward tilt to capture building facade
             "fov": 90,  # Field of view
             "key": self.api_key
         }
+        if pano_id:
+            params["pano"] = pano_id
+        else:
+            params["location"] = address
 
-        response = await client.get(
-            self.BASE_URL,
-            params=params,
-            timeout=30.0
-        )
+        response = await self._get(client, self.BASE_URL, params=params, timeout=30.0)
 
         if response.status_code == 200:
             # Check if we got an actual image (not an error image)
             content_type = response.headers.get("content-type", "")
             if "image" in content_type:
-                filename = f"streetview_{index}_{heading}deg.jpg"
-                filepath = output_dir / filename
-
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
+                data = response.content
+                if pano_id and self.image_cache is not None:
+                    self._spawn(
+                        self._sanitize_folder_name(address),
+                        executor.run_io(self.image_cache.put, pano_id, heading, size, data)
+                    )
 
-                logger.info(f"Saved image: {filepath}")
-                return str(filepath)
+                logger.info(f"Fetched image: {address} heading {heading}")
+                return StreetViewImage(filename, heading, data, filepath)
 
         raise Exception(f"Failed to fetch image for heading {heading}: {response.status_code}")
 
+    def _spawn(self, folder_name: str, coro: Awaitable) -> None:
+        """Run a side task (disk writes) for an address without blocking the pipeline."""
+        task = asyncio.ensure_future(coro)
+        tasks = self._background_tasks.setdefault(folder_name, set())
+        tasks.add(task)
+
+        def done(task: asyncio.Future) -> None:
+            tasks.discard(task)
+            if not tasks and self._background_tasks.get(folder_name) is tasks:
+                del self._background_tasks[folder_name]
+
+        task.add_done_callback(done)
+        task.add_done_callback(self._log_background_error)
+
+    @staticmethod
+    def _log_background_error(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background image task failed: {task.exception()}")
+
+    async def _persist(self, folder_name: str, images: List[StreetViewImage]) -> None:
+        """
+        Write a building's images to its folder, then build their variants.
+
+        Frames left by earlier scans of the address (other headings) are
+        removed, so downloads and the viewer only show the current scan.
+        """
+        address_dir = self.output_dir / folder_name
+        await executor.run_io(address_dir.mkdir, parents=True, exist_ok=True)
+        await asyncio.gather(*(
+            executor.run_io(image.path.write_bytes, image.data) for image in images
+        ))
+        await executor.run_io(
+            self._remove_stale_frames, folder_name, {image.filename for image in images}
+        )
+        await executor.run_io(self.build_variants, folder_name)
+
+    def _remove_stale_frames(self, folder_name: str, keep: Set[str]) -> None:
+        """Delete a folder's original images not in `keep`, with their variants."""
+        for image_path in (self.output_dir / folder_name).glob("*.jpg"):
+            if image_path.name in keep:
+                continue
+            for variant in IMAGE_VARIANTS:
+                self._variant_path(folder_name, image_path.name, variant).unlink(missing_ok=True)
+            image_path.unlink(missing_ok=True)
+            logger.info(f"Removed stale frame {folder_name}/{image_path.name}")
+
+    async def wait_background(self, folder_names: Optional[Iterable[str]] = None) -> None:
+        """
+        Wait for pending image writes, cache puts and variant builds.
+
+        Args:
+            folder_names: Address folders to wait for (None: every address,
+                including other jobs')
+        """
+        folder_names = None if folder_names is None else set(folder_names)
+        while True:
+            pending = [
+                task
+                for folder_name, tasks in list(self._background_tasks.items())
+                if folder_names is None or folder_name in folder_names
+                for task in tasks
+            ]
+            if not pending:
+                return
+            await asyncio.gather(*pending, return_exceptions=True)
+
     def get_folder_name(self, address: str) -> str:
         """Get the folder name that would be used for an address."""
         return self._sanitize_folder_name(address)
@@ -190,49 +654,130 @@ class ImageService:
             return [str(p) for p in folder_path.glob("*.jpg")]
         return []
 
-    def compress_image(self, image_path: str, quality: int = COMPRESS_QUALITY) -> bytes:
+    def compress_image(
+        self,
+        image_path: str,
+        quality: int = COMPRESS_QUALITY,
+        max_size: Optional[int] = None
+    ) -> bytes:
         """
         Compress an image to JPEG with specified quality.
 
+        Blocking: call from a worker thread, not the event loop. With
+        BLOCKING_EXECUTOR=process the encode runs in a worker process.
+
         Args:
             image_path: Path to the image file
             quality: JPEG quality (0-100)
+            max_size: Optional longest-side limit in pixels (downscales)
 
         Returns:
             Compressed image as bytes
         """
+        return executor.call_cpu(compress_image_file, image_path, quality, max_size)
+
+    def _variant_path(self, folder_name: str, filename: str, variant: str) -> Path:
+        stem = Path(filename).stem
+        return self.output_dir / folder_name / VARIANTS_DIR / f"{stem}_{variant}.jpg"
+
+    def build_variants(self, folder_name: str) -> Dict[str, Dict[str, Dict]]:
+        """
+        Create every IMAGE_VARIANTS rendition of a folder's images.
+
+        Variants are written to `<folder>/variants/` next to the originals,
+        with a `manifest.json` describing them. Existing, up-to-date
+        variants are skipped, so this is cheap to call repeatedly.
+
+        Args:
+            folder_name: Name of the folder
+
+        Returns:
+            The manifest: {original filename: {variant: {file, bytes}}}
+        """
+        folder_path = self.output_dir / folder_name
+        if not folder_path.exists():
+            return {}
+
+        (folder_path / VARIANTS_DIR).mkdir(exist_ok=True)
+        manifest: Dict[str, Dict[str, Dict]] = {}
+
+        for image_path in sorted(folder_path.glob("*.jpg")):
+            manifest[image_path.name] = {}
+            for variant in IMAGE_VARIANTS:
+                variant_path = self._ensure_variant(folder_name, image_path, variant)
+                manifest[image_path.name][variant] = {
+                    "file": f"{VARIANTS_DIR}/{variant_path.name}",
+                    "bytes": variant_path.stat().st_size,
+                }
+
+        manifest_path = folder_path / VARIANTS_DIR / "manifest.json"
+        tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+    def _ensure_variant(self, folder_name: str, image_path: Path, variant: str) -> Path:
+        """Return the variant file for an original, creating it if missing or stale."""
+        variant_path = self._variant_path(folder_name, image_path.name, variant)
+        if variant_path.exists() and variant_path.stat().st_mtime >= image_path.stat().st_mtime:
+            return variant_path
+
+        variant_path.parent.mkdir(exist_ok=True)
+        settings = IMAGE_VARIANTS[variant]
+        data = self.compress_image(str(image_path), settings["quality"], settings["max_size"])
+        # Write atomically: background builds and downloads may race
+        tmp_path = variant_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, variant_path)
+        return variant_path
+
+    def get_manifest(self, folder_name: str) -> Dict[str, Dict[str, Dict]]:
+        """Read a folder's variant manifest, building the variants if it's missing."""
+        manifest_path = self.output_dir / folder_name / VARIANTS_DIR / "manifest.json"
         try:
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary (for PNG with alpha)
-                if img.mode in ('RGBA', 'P'):
-                    img = img.convert('RGB')
-
-                # Compress to JPEG
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=quality, optimize=True)
-                return buffer.getvalue()
-        except Exception as e:
-            logger.error(f"Error compressing image {image_path}: {e}")
-            # Return original file content as fallback
-            with open(image_path, 'rb') as f:
-                return f.read()
+            return json.loads(manifest_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self.build_variants(folder_name)
 
-    def get_compressed_images(self, folder_name: str) -> List[tuple]:
+    def get_variant_path(
+        self,
+        folder_name: str,
+        filename: str,
+        variant: Optional[str] = None
+    ) -> Optional[Path]:
         """
-        Get all images for a folder as compressed bytes.
+        Resolve an image (or one of its variants) to a file on disk.
 
         Args:
             folder_name: Name of the folder
+            filename: Original image filename
+            variant: IMAGE_VARIANTS key, or None for the original
 
         Returns:
-            List of (filename, compressed_bytes) tuples
+            Path to the file, or None if the image doesn't exist
+        """
+        image_path = self.output_dir / folder_name / filename
+        if not image_path.is_file():
+            return None
+        if variant is None:
+            return image_path
+        return self._ensure_variant(folder_name, image_path, variant)
+
+    def iter_compressed_images(self, folder_name: str) -> Iterator[Tuple[str, Path]]:
+        """
+        List a folder's download-quality images, one at a time.
+
+        Uses the precomputed "download" variants, creating any that are
+        missing, so archive building is a plain file copy.
+
+        Args:
+            folder_name: Name of the folder
+
+        Yields:
+            (filename, path to compressed file) tuples
         """
-        images = []
         folder_path = self.output_dir / folder_name
 
         if folder_path.exists():
-            for image_path in folder_path.glob("*.jpg"):
-                compressed = self.compress_image(str(image_path))
-                images.append((image_path.name, compressed))
-
-        return images
+            for image_path in sorted(folder_path.glob("*.jpg")):
+                yield image_path.name, self._ensure_variant(folder_name, image_path, "download")
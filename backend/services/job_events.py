@@ -0,0 +1,36 @@
+"""Change notifications for jobs running in this process (progress streams)."""
+
+import asyncio
+from typing import Dict
+
+
+class JobEvents:
+    """
+    Wakes progress streams as soon as a local job changes.
+
+    A stream takes `changed(job_id)` *before* reading the job's state and
+    then waits on it; `notify()` sets and replaces the event, so a change
+    that lands between the read and the wait is never missed. Jobs run by
+    another process (queue workers) never notify; their streams poll the
+    job store instead.
+    """
+
+    def __init__(self):
+        self._events: Dict[str, asyncio.Event] = {}
+
+    def changed(self, job_id: str) -> asyncio.Event:
+        """Get the event set by the job's next change."""
+        event = self._events.get(job_id)
+        if event is None:
+            event = self._events[job_id] = asyncio.Event()
+        return event
+
+    def notify(self, job_id: str) -> None:
+        """Wake everything waiting on the job."""
+        event = self._events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+
+# Global job change notifier
+job_events = JobEvents()
@@ -0,0 +1,350 @@
+"""Durable job store: job status and per-address result checkpoints in SQLite."""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import logging
+
+from models import AddressInput, BuildingResult, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states were cut off by a restart and can be resumed
+RESUMABLE_STATUSES = ("pending", "processing")
+
+
+class JobStore:
+    """
+    Persistent store for jobs, their input addresses and finished results.
+
+    Each `BuildingResult` is checkpointed under its input index as soon as
+    the address finishes, so a crash or redeploy loses at most the addresses
+    that were in flight. Job status is stored without its results (those
+    are reassembled from the checkpoints on load, and the processed count
+    follows from them). WAL mode, like the caches, so the API and worker
+    processes can share one file; `patch()` updates fields in place for
+    writers that don't own the job's full status. Inline jobs record the
+    process running them as their owner, and `claim()` hands an
+    interrupted job to exactly one restarted process. All methods are
+    blocking; call them through the executor.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    job TEXT NOT NULL,
+                    addresses TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                # Stores created before jobs had owners
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_results (
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    PRIMARY KEY (job_id, idx)
+                )
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _dump_job(job: JobStatus) -> str:
+        return job.model_dump_json(exclude={"results"})
+
+    def create(
+        self,
+        job: JobStatus,
+        addresses: List[AddressInput],
+        owner: Optional[str] = None
+    ) -> None:
+        """
+        Store a new job with its input addresses.
+
+        Args:
+            job: Initial job status
+            addresses: Parsed input addresses, in order
+            owner: Process running the job (None: queue workers run it)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(job_id, status, job, addresses, created_at, updated_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id, job.status, self._dump_job(job),
+                    json.dumps([address.model_dump() for address in addresses]),
+                    now, now, owner
+                )
+            )
+            self._conn.commit()
+
+    def update(self, job: JobStatus) -> None:
+        """Save a job's status fields (its results are stored as checkpoints)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, job = ?, updated_at = ? WHERE job_id = ?",
+                (job.status, self._dump_job(job), time.time(), job.job_id)
+            )
+            self._conn.commit()
+
+    def patch(self, job_id: str, **fields: Any) -> None:
+        """
+        Update some of a job's status fields, leaving the others as stored.
+
+        Read and write happen in one IMMEDIATE transaction, so concurrent
+        patches from several processes don't overwrite each other.
+
+        Args:
+            job_id: Job ID
+            **fields: JobStatus fields to set (e.g. status, error)
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT job FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is not None:
+                    job = JobStatus.model_validate_json(row[0]).model_copy(update=fields)
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, job = ?, updated_at = ? WHERE job_id = ?",
+                        (job.status, self._dump_job(job), time.time(), job_id)
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def save_result(
+        self,
+        job_id: str,
+        index: int,
+        result: BuildingResult,
+        worker: Optional[str] = None
+    ) -> bool:
+        """
+        Checkpoint one finished address.
+
+        Args:
+            job_id: Job ID
+            index: Input index of the address
+            result: The address's result
+            worker: Queue worker that must still hold the address's task
+                (TaskQueue on the same database); None saves unconditionally
+
+        Returns:
+            False if `worker` no longer holds the task and nothing was saved
+        """
+        with self._lock:
+            if worker is None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO job_results (job_id, idx, result) VALUES (?, ?, ?)",
+                    (job_id, index, result.model_dump_json())
+                )
+            else:
+                # Check and write in one statement: a reclaimed task can't slip in between
+                cursor = self._conn.execute(
+                    "INSERT OR REPLACE INTO job_results (job_id, idx, result) "
+                    "SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM tasks WHERE job_id = ? "
+                    "AND idx = ? AND status = 'running' AND worker = ?)",
+                    (job_id, index, result.model_dump_json(), job_id, index, worker)
+                )
+                if cursor.rowcount == 0:
+                    self._conn.commit()
+                    return False
+            self._conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id)
+            )
+            self._conn.commit()
+        return True
+
+    def get_results(self, job_id: str) -> Dict[int, BuildingResult]:
+        """Get every checkpointed result of a job, keyed by input index."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, result FROM job_results WHERE job_id = ? ORDER BY idx",
+                (job_id,)
+            ).fetchall()
+        return {idx: BuildingResult.model_validate_json(result) for idx, result in rows}
+
+    def get_results_since(
+        self,
+        job_id: str,
+        start: int,
+        limit: Optional[int] = None
+    ) -> List[BuildingResult]:
+        """
+        Get the contiguous run of checkpointed results from input index `start`.
+
+        Stops at the first address not finished yet, so consecutive calls
+        page through the same in-order prefix `load()` returns.
+
+        Args:
+            job_id: Job ID
+            start: First input index to return
+            limit: Maximum number of results (None for all)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, result FROM job_results WHERE job_id = ? AND idx >= ? "
+                "ORDER BY idx LIMIT ?",
+                (job_id, start, -1 if limit is None else limit)
+            ).fetchall()
+        results = []
+        for idx, result in rows:
+            if idx != start + len(results):
+                break
+            results.append(BuildingResult.model_validate_json(result))
+        return results
+
+    def get_addresses(self, job_id: str) -> List[AddressInput]:
+        """Get a job's input addresses, in order."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT addresses FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return [AddressInput(**address) for address in json.loads(row[0])] if row else []
+
+    def get_status(self, job_id: str) -> Optional[JobStatus]:
+        """
+        Load a job's status without its results (cheap at any job size).
+
+        Returns:
+            JobStatus with `results` unset, or None if the job is unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT j.job, (SELECT COUNT(*) FROM job_results r WHERE r.job_id = j.job_id) "
+                "FROM jobs j WHERE j.job_id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = JobStatus.model_validate_json(row[0])
+        job.processed_addresses = max(job.processed_addresses, row[1])
+        return job
+
+    def load(self, job_id: str) -> Optional[JobStatus]:
+        """
+        Load a job with its results.
+
+        `results` holds the contiguous prefix of checkpointed results, the
+        same in-order view a running job publishes.
+
+        Returns:
+            JobStatus, or None if the job is unknown
+        """
+        job = self.get_status(job_id)
+        if job is None:
+            return None
+
+        checkpoints = self.get_results(job_id)
+        job.results = []
+        while len(job.results) in checkpoints:
+            job.results.append(checkpoints[len(job.results)])
+        return job
+
+    def list_jobs(self) -> List[JobStatus]:
+        """List every stored job (without results), oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT j.job, COUNT(r.idx) FROM jobs j "
+                "LEFT JOIN job_results r ON r.job_id = j.job_id "
+                "GROUP BY j.job_id ORDER BY j.created_at"
+            ).fetchall()
+        jobs = []
+        for data, checkpointed in rows:
+            job = JobStatus.model_validate_json(data)
+            job.processed_addresses = max(job.processed_addresses, checkpointed)
+            jobs.append(job)
+        return jobs
+
+    def interrupted(self) -> List[Tuple[str, int]]:
+        """
+        Find jobs a restart cut off.
+
+        Returns:
+            (job_id, checkpointed result count) of each pending or processing job
+        """
+        placeholders = ", ".join("?" for _ in RESUMABLE_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT j.job_id, COUNT(r.idx) FROM jobs j "
+                f"LEFT JOIN job_results r ON r.job_id = j.job_id "
+                f"WHERE j.status IN ({placeholders}) GROUP BY j.job_id ORDER BY j.created_at",
+                RESUMABLE_STATUSES
+            ).fetchall()
+        return [(job_id, count) for job_id, count in rows]
+
+    def claim(
+        self,
+        job_id: str,
+        owner: str,
+        owner_alive: Callable[[str, float], bool]
+    ) -> bool:
+        """
+        Take over an interrupted job, unless a live process already runs it.
+
+        The check and the update happen in one IMMEDIATE transaction, so of
+        several processes restarting together exactly one wins each job.
+
+        Args:
+            job_id: Job ID
+            owner: Claiming process
+            owner_alive: Tells whether a recorded owner (given the job's
+                last update time) may still be running the job
+
+        Returns:
+            True if the caller now owns the job and should resume it
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT status, owner, updated_at FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                claimed = (
+                    row is not None
+                    and row[0] in RESUMABLE_STATUSES
+                    and (row[1] is None or row[1] == owner or not owner_alive(row[1], row[2]))
+                )
+                if claimed:
+                    self._conn.execute(
+                        "UPDATE jobs SET owner = ?, updated_at = ? WHERE job_id = ?",
+                        (owner, time.time(), job_id)
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return claimed
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
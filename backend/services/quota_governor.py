@@ -0,0 +1,275 @@
+"""Client-side outbound quota governor (token buckets with AIMD on 429s)."""
+
+import time
+import asyncio
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+import logging
+
+import httpx
+from openai import RateLimitError
+
+from services.concurrency import env_int
+
+logger = logging.getLogger(__name__)
+
+# Default upstream quotas per minute (override with environment variables)
+DEFAULT_STREETVIEW_RPM = 3000
+DEFAULT_SEARCH_RPM = 100
+DEFAULT_OPENAI_RPM = 500
+DEFAULT_OPENAI_TPM = 30000
+
+# AIMD tuning: halve the rate on a 429, win back 5% of the quota per success
+AIMD_DECREASE_FACTOR = 0.5
+AIMD_INCREASE_FRACTION = 0.05
+# Never throttle below this fraction of the configured quota
+AIMD_MIN_FRACTION = 0.05
+# Pause used when a 429 carries no Retry-After header (seconds)
+DEFAULT_RETRY_AFTER = 5.0
+# Times a rate-limited request is re-sent after the governor's pause
+RATE_LIMIT_RETRIES = 3
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Parse a Retry-After (or retry-after-ms) header into seconds."""
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at an adaptive per-minute rate.
+
+    The rate follows AIMD: each 429 multiplies it by AIMD_DECREASE_FACTOR
+    (and pauses the bucket for Retry-After), each success adds back a small
+    slice of the configured quota. Concurrent jobs therefore converge just
+    under the real upstream limit.
+    """
+
+    def __init__(self, name: str, per_minute: int):
+        self.name = name
+        self.max_rate = float(per_minute)
+        self.rate = float(per_minute)
+        self.min_rate = max(1.0, per_minute * AIMD_MIN_FRACTION)
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.paused_until = 0.0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate / 60)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until `amount` tokens are available, then consume them."""
+        amount = min(amount, self.capacity)
+        started = time.monotonic()
+
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    break
+                await asyncio.sleep((amount - self.tokens) * 60 / self.rate)
+
+        self.wait_seconds += time.monotonic() - started
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) tokens after the fact, e.g. actual vs estimated usage."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    def on_success(self) -> None:
+        """Additive increase toward the configured quota."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate * AIMD_INCREASE_FRACTION)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease, and pause until the upstream's Retry-After."""
+        self.rate_limited += 1
+        self.rate = max(self.min_rate, self.rate * AIMD_DECREASE_FACTOR)
+        pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        # Drop any burst allowance so requests resume at the reduced rate
+        self.tokens = min(self.tokens, 0.0)
+        logger.warning(
+            f"Quota governor: {self.name} rate limited, "
+            f"rate now {self.rate:.0f}/min, paused {pause:.1f}s"
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get current rate and counters."""
+        return {
+            "rate_per_minute": round(self.rate, 1),
+            "max_per_minute": self.max_rate,
+            "rate_limited": self.rate_limited,
+            "wait_seconds": round(self.wait_seconds, 2),
+        }
+
+
+class QuotaGovernor:
+    """
+    Shared token buckets per upstream (requests/min, plus tokens/min for OpenAI).
+
+    Buckets live in process memory. Processes drawing on the same account
+    (queue workers) must each get a share of the quota via `split()`.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {
+            "streetview": TokenBucket(
+                "streetview", env_int("QUOTA_STREETVIEW_RPM", DEFAULT_STREETVIEW_RPM)
+            ),
+            "search": TokenBucket(
+                "search", env_int("QUOTA_SEARCH_RPM", DEFAULT_SEARCH_RPM)
+            ),
+            "openai": TokenBucket(
+                "openai", env_int("QUOTA_OPENAI_RPM", DEFAULT_OPENAI_RPM)
+            ),
+            "openai_tokens": TokenBucket(
+                "openai_tokens", env_int("QUOTA_OPENAI_TPM", DEFAULT_OPENAI_TPM)
+            ),
+        }
+
+    def split(self, processes: int) -> None:
+        """
+        Give this process a 1/`processes` share of every configured quota.
+
+        Call before any request is made; buckets are rebuilt empty of history.
+
+        Args:
+            processes: Number of processes sharing the quotas
+        """
+        if processes <= 1:
+            return
+        self.buckets = {
+            name: TokenBucket(name, max(1, int(bucket.max_rate) // processes))
+            for name, bucket in self.buckets.items()
+        }
+        logger.info(f"Quota governor: quotas split across {processes} processes")
+
+    async def acquire(self, upstream: str, tokens: Optional[int] = None) -> None:
+        """
+        Wait for quota on an upstream.
+
+        Args:
+            upstream: Upstream name ("streetview", "search", "openai")
+            tokens: Estimated model tokens for the request (OpenAI only)
+        """
+        await self.buckets[upstream].acquire()
+        if tokens and f"{upstream}_tokens" in self.buckets:
+            await self.buckets[f"{upstream}_tokens"].acquire(tokens)
+
+    def record_success(self, upstream: str) -> None:
+        """Report a successful (non-429) response."""
+        self.buckets[upstream].on_success()
+        if f"{upstream}_tokens" in self.buckets:
+            self.buckets[f"{upstream}_tokens"].on_success()
+
+    def record_rate_limited(self, upstream: str, retry_after: Optional[float] = None) -> None:
+        """Report a 429 from an upstream."""
+        self.buckets[upstream].on_rate_limited(retry_after)
+        if f"{upstream}_tokens" in self.buckets:
+            self.buckets[f"{upstream}_tokens"].on_rate_limited(retry_after)
+
+    def record_tokens(self, upstream: str, actual: int, estimated: int) -> None:
+        """Correct the token bucket once the real usage of a request is known."""
+        if f"{upstream}_tokens" in self.buckets:
+            self.buckets[f"{upstream}_tokens"].adjust(actual - estimated)
+
+    async def request(
+        self,
+        upstream: str,
+        send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send an HTTP request under the upstream's quota.
+
+        429 responses feed the AIMD controller and the request is re-sent
+        (up to RATE_LIMIT_RETRIES times) once the bucket allows it, instead
+        of the caller silently losing the data.
+
+        Args:
+            upstream: Upstream name
+            send: Zero-argument coroutine function performing the request
+
+        Returns:
+            The final response
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await self.acquire(upstream)
+            response = await send()
+            if response.status_code != 429:
+                self.record_success(upstream)
+                return response
+            self.record_rate_limited(upstream, parse_retry_after(response.headers))
+        return response
+
+    async def openai_call(
+        self,
+        create: Callable[[], Awaitable[Any]],
+        estimated_tokens: int
+    ) -> Any:
+        """
+        Run an OpenAI request under the requests/min and tokens/min quotas.
+
+        The token bucket is charged with an estimate up front and corrected
+        from `response.usage` afterwards. A RateLimitError feeds the AIMD
+        controller and the request is re-sent once the bucket allows it.
+
+        Args:
+            create: Zero-argument coroutine function performing the request
+            estimated_tokens: Prompt estimate plus max_tokens
+
+        Returns:
+            The OpenAI response
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await self.acquire("openai", tokens=estimated_tokens)
+            try:
+                response = await create()
+            except RateLimitError as e:
+                self.record_rate_limited("openai", parse_retry_after(e.response.headers))
+                if attempt == RATE_LIMIT_RETRIES:
+                    raise
+                continue
+
+            self.record_success("openai")
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                self.record_tokens("openai", usage.total_tokens, estimated_tokens)
+            return response
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get stats for every bucket."""
+        return {name: bucket.get_stats() for name, bucket in self.buckets.items()}
+
+
+# Global quota governor instance
+quota_governor = QuotaGovernor()
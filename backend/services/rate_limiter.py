@@ -1,7 +1,10 @@
 """Rate limiting service for Building Scanner."""
 
 import time
-from typing import Dict, Tuple
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 from collections import defaultdict
 import logging
 
@@ -13,23 +16,67 @@ RATE_LIMIT_WINDOW = 3600  # 1 hour in seconds
 
 
 class RateLimiter:
-    """In-memory rate limiter tracking buildings processed per IP."""
+    """
+    Rate limiter tracking buildings processed per IP.
+
+    Usage is kept in memory by default. After `use_database()` it lives in
+    a SQLite file instead, so every API process on the box (uvicorn
+    workers, the queue deployment) enforces one shared limit.
+    """
 
     def __init__(self, limit: int = RATE_LIMIT_BUILDINGS, window: int = RATE_LIMIT_WINDOW):
         self.limit = limit
         self.window = window
         # Dict of IP -> list of (timestamp, building_count) tuples
         self._requests: Dict[str, list] = defaultdict(list)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def use_database(self, path: Union[str, Path]) -> None:
+        """
+        Keep usage in a SQLite file shared by every process using it.
+
+        Args:
+            path: Database file (created if missing)
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: `consume` opens its own IMMEDIATE transaction
+        conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit (
+                ip TEXT NOT NULL,
+                ts REAL NOT NULL,
+                count INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS rate_limit_ip ON rate_limit (ip, ts)")
+        with self._lock:
+            self._conn = conn
 
     def _cleanup_old_requests(self, ip: str) -> None:
         """Remove requests older than the time window."""
         now = time.time()
         cutoff = now - self.window
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM rate_limit WHERE ip = ? AND ts <= ?", (ip, cutoff))
+            return
         self._requests[ip] = [
             (ts, count) for ts, count in self._requests[ip]
             if ts > cutoff
         ]
 
+    def _entries(self, ip: str) -> List[Tuple[float, int]]:
+        """Get an IP's (timestamp, building_count) entries within the window."""
+        self._cleanup_old_requests(ip)
+        if self._conn is not None:
+            return self._conn.execute(
+                "SELECT ts, count FROM rate_limit WHERE ip = ?", (ip,)
+            ).fetchall()
+        return self._requests[ip]
+
     def get_usage(self, ip: str) -> Tuple[int, int]:
         """
         Get current usage for an IP.
@@ -40,8 +87,8 @@ class RateLimiter:
         Returns:
             Tuple of (buildings_used, buildings_remaining)
         """
-        self._cleanup_old_requests(ip)
-        used = sum(count for _, count in self._requests[ip])
+        with self._lock:
+            used = sum(count for _, count in self._entries(ip))
         remaining = max(0, self.limit - used)
         return used, remaining
 
@@ -56,7 +103,6 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, message)
         """
-        self._cleanup_old_requests(ip)
         used, remaining = self.get_usage(ip)
 
         if building_count > remaining:
@@ -73,9 +119,51 @@ class RateLimiter:
             ip: Client IP address
             building_count: Number of buildings processed
         """
-        self._requests[ip].append((time.time(), building_count))
+        self._record(ip, building_count)
         logger.info(f"Rate limit: IP {ip} used {building_count} buildings. Total: {self.get_usage(ip)[0]}/{self.limit}")
 
+    def _record(self, ip: str, building_count: int) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO rate_limit (ip, ts, count) VALUES (?, ?, ?)",
+                    (ip, time.time(), building_count)
+                )
+            else:
+                self._requests[ip].append((time.time(), building_count))
+
+    def consume(self, ip: str, building_count: int) -> Tuple[bool, str]:
+        """
+        Check the limit and record usage in one step.
+
+        With a database this is one IMMEDIATE transaction, so two processes
+        can't both admit uploads that together exceed the limit.
+
+        Args:
+            ip: Client IP address
+            building_count: Number of buildings in this request
+
+        Returns:
+            Tuple of (is_allowed, message); usage is only recorded when allowed
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                allowed, message = self.check_limit(ip, building_count)
+                if allowed:
+                    self._record(ip, building_count)
+                if self._conn is not None:
+                    self._conn.execute("COMMIT")
+            except Exception:
+                if self._conn is not None:
+                    self._conn.execute("ROLLBACK")
+                raise
+
+        if allowed:
+            logger.info(f"Rate limit: IP {ip} used {building_count} buildings. Total: {self.get_usage(ip)[0]}/{self.limit}")
+        return allowed, message
+
     def get_reset_time(self, ip: str) -> int:
         """
         Get seconds until the oldest request expires.
@@ -86,11 +174,12 @@ class RateLimiter:
         Returns:
             Seconds until some quota is freed, or 0 if no requests
         """
-        self._cleanup_old_requests(ip)
-        if not self._requests[ip]:
+        with self._lock:
+            entries = self._entries(ip)
+        if not entries:
             return 0
 
-        oldest_ts = min(ts for ts, _ in self._requests[ip])
+        oldest_ts = min(ts for ts, _ in entries)
         reset_time = int(oldest_ts + self.window - time.time())
         return max(0, reset_time)
 
@@ -0,0 +1,230 @@
+"""Retry with backoff and per-upstream circuit breakers for external calls."""
+
+import os
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+
+import httpx
+import openai
+
+from services.concurrency import env_int
+
+logger = logging.getLogger(__name__)
+
+# Retry defaults (override with environment variables)
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 0.5  # seconds
+DEFAULT_RETRY_MAX_DELAY = 8.0  # seconds
+
+# Per-request OpenAI timeout (the SDK default is 10 minutes)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 60))
+
+# Circuit breaker defaults
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 5  # consecutive transient failures
+DEFAULT_BREAKER_RESET_TIMEOUT = 30.0  # seconds before a trial call
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"{upstream} circuit open, retry in {retry_in:.0f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+class TransientHTTPError(Exception):
+    """Raised for retryable HTTP status codes (5xx) so they count as failures."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code} from {response.request.url.host}")
+        self.response = response
+
+
+# Errors worth retrying: timeouts, connection problems and server errors
+TRANSIENT_ERRORS = (
+    httpx.TimeoutException,
+    httpx.TransportError,
+    TransientHTTPError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def raise_for_transient(response: httpx.Response) -> httpx.Response:
+    """Raise TransientHTTPError for 5xx responses, otherwise return the response."""
+    if response.status_code >= 500:
+        raise TransientHTTPError(response)
+    return response
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed -> open after `failure_threshold` transient failures in a row;
+    open -> half_open after `reset_timeout`, letting one trial call through;
+    half_open -> closed on success, or back to open on failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if calls should not go through right now."""
+        if self.state == "open":
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.short_circuited += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = "half_open"
+
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                self.short_circuited += 1
+                raise CircuitOpenError(self.name, 0)
+            self._trial_in_flight = True
+
+    def release_trial(self) -> None:
+        """Free a half-open trial slot without judging upstream health."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"Circuit breaker {self.name} closed")
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"Circuit breaker {self.name} opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class Resilience:
+    """Runs external calls with exponential backoff (full jitter) behind per-upstream breakers."""
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ):
+        self.max_attempts = max_attempts or env_int("RETRY_MAX_ATTEMPTS", DEFAULT_RETRY_ATTEMPTS)
+        self.base_delay = base_delay or _env_float("RETRY_BASE_DELAY", DEFAULT_RETRY_BASE_DELAY)
+        self.max_delay = max_delay or _env_float("RETRY_MAX_DELAY", DEFAULT_RETRY_MAX_DELAY)
+        self._failure_threshold = env_int(
+            "BREAKER_FAILURE_THRESHOLD", DEFAULT_BREAKER_FAILURE_THRESHOLD
+        )
+        self._reset_timeout = _env_float(
+            "BREAKER_RESET_TIMEOUT", DEFAULT_BREAKER_RESET_TIMEOUT
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+
+    def breaker(self, upstream: str) -> CircuitBreaker:
+        """Get (creating on first use) the breaker for an upstream."""
+        if upstream not in self.breakers:
+            self.breakers[upstream] = CircuitBreaker(
+                upstream, self._failure_threshold, self._reset_timeout
+            )
+        return self.breakers[upstream]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a 1-based attempt number."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def call(
+        self,
+        upstream: str,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Call an upstream, retrying transient errors with backoff.
+
+        Args:
+            upstream: Upstream name (one breaker per name)
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            Whatever `func` returns
+
+        Raises:
+            CircuitOpenError: If the upstream's breaker is open
+            Exception: The last error once retries are exhausted, or any
+                non-transient error immediately
+        """
+        breaker = self.breaker(upstream)
+
+        for attempt in range(1, self.max_attempts + 1):
+            breaker.before_call()
+            try:
+                result = await func()
+            except TRANSIENT_ERRORS as e:
+                breaker.record_failure()
+                self.failures[upstream] = self.failures.get(upstream, 0) + 1
+                if attempt == self.max_attempts or breaker.state == "open":
+                    raise
+                delay = self.backoff(attempt)
+                self.retries[upstream] = self.retries.get(upstream, 0) + 1
+                logger.warning(
+                    f"{upstream} call failed ({type(e).__name__}: {e}), "
+                    f"retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Not the upstream's fault (bad input, cancellation)
+                breaker.release_trial()
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get breaker state and retry/failure counts per upstream."""
+        return {
+            upstream: {
+                **breaker.get_stats(),
+                "retries": self.retries.get(upstream, 0),
+                "transient_failures": self.failures.get(upstream, 0),
+            }
+            for upstream, breaker in self.breakers.items()
+        }
+
+
+# Global resilience instance shared by all services
+resilience = Resilience()
@@ -0,0 +1,163 @@
+"""Append-only, crash-safe results CSV written as addresses finish."""
+
+import io
+import os
+import csv
+import json
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Sequence, Tuple, Union
+import logging
+
+from models import BuildingResult
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking (inline mode only)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+RESULTS_CSV_FIELDS = [
+    "street_number", "street_name", "zip_code", "state", "county",
+    "building_type", "wwr_estimate", "confidence", "reasoning",
+    "images_folder", "vision_tokens", "vision_model", "vision_detail",
+    "local_wwr_estimate", "error"
+]
+
+
+def result_row(result: BuildingResult) -> Dict[str, object]:
+    """Flatten a result into a results CSV row."""
+    return {
+        "street_number": result.street_number,
+        "street_name": result.street_name,
+        "zip_code": result.zip_code,
+        "state": result.state or "",
+        "county": result.county or "",
+        "building_type": result.building_type.value if result.building_type else "",
+        "wwr_estimate": result.wwr_estimate if result.wwr_estimate is not None else "",
+        "confidence": result.confidence.value if result.confidence else "",
+        "reasoning": result.reasoning or "",
+        "images_folder": result.images_folder or "",
+        "vision_tokens": result.token_usage.total_tokens if result.token_usage else "",
+        "vision_model": result.vision_model or "",
+        "vision_detail": result.vision_detail.value if result.vision_detail else "",
+        "local_wwr_estimate": result.facade_estimate.wwr_estimate if result.facade_estimate else "",
+        "error": result.error or ""
+    }
+
+
+class ResultsCSVWriter:
+    """
+    Results CSV of one job, appended in input order as results arrive.
+
+    A sidecar `<csv>.idx` records how many rows (and bytes) are committed.
+    Each `append()` runs under an exclusive lock on the CSV, truncates any
+    tail a crash left behind the committed size, writes the next rows,
+    fsyncs and only then moves the index forward. So the file always holds
+    a clean, in-order prefix of the job's results, written exactly once,
+    even with several worker processes appending. Blocking; call it
+    through the executor.
+    """
+
+    # Per-file locks serializing appends within a process where flock is
+    # unavailable; an entry lives as long as a writer of that file
+    _path_locks: "weakref.WeakValueDictionary[Path, threading.Lock]" = weakref.WeakValueDictionary()
+    _path_locks_guard = threading.Lock()
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        key = self.path.resolve()
+        with self._path_locks_guard:
+            self._thread_lock = self._path_locks.get(key)
+            if self._thread_lock is None:
+                self._thread_lock = self._path_locks[key] = threading.Lock()
+
+    def committed(self) -> Tuple[int, int]:
+        """
+        Get the committed size of the file.
+
+        Returns:
+            Tuple of (result rows, bytes including the header)
+        """
+        try:
+            state = json.loads(self.index_path.read_text())
+            return state["rows"], state["bytes"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return 0, 0
+
+    def _commit(self, rows: int, size: int) -> None:
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"rows": rows, "bytes": size}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[io.BufferedRandom]:
+        with self._thread_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+b") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield f
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def append(self, results_from: Callable[[int], Sequence[BuildingResult]]) -> int:
+        """
+        Append the results that follow the committed rows.
+
+        Args:
+            results_from: Returns the job's in-order results starting at a
+                given index (called under the lock with the committed row
+                count, so concurrent appenders never write a row twice)
+
+        Returns:
+            Number of result rows committed
+        """
+        with self._locked() as f:
+            rows, size = self.committed()
+            results = results_from(rows)
+
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=RESULTS_CSV_FIELDS)
+            if size == 0:
+                writer.writeheader()
+            for result in results:
+                writer.writerow(result_row(result))
+            data = buffer.getvalue().encode("utf-8")
+
+            # Drop anything written after the last commit (a crash mid-append)
+            f.truncate(size)
+            if data:
+                # "a+b" appends at the end, which is now the committed size
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                rows += len(results)
+                size += len(data)
+                self._commit(rows, size)
+
+        return rows
+
+    def iter_committed(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Read the committed prefix of the file, for partial downloads.
+
+        Rows a writer is still appending are never included.
+        """
+        _, size = self.committed()
+        with open(self.path, "rb") as f:
+            while size > 0:
+                chunk = f.read(min(chunk_size, size))
+                if not chunk:
+                    break
+                size -= len(chunk)
+                yield chunk
@@ -1,13 +1,39 @@
 """Service for web searches using Google Custom Search API."""
 
 import os
+import re
 import httpx
 import asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from services.cache_store import SQLiteCache
+from services.concurrency import concurrency_limits
+from services.executor import executor
+from services.http_clients import client_session
+from services.quota_governor import quota_governor
+from services.resilience import raise_for_transient, resilience
+
 logger = logging.getLogger(__name__)
 
+# Per-query result cache lifetimes in seconds
+SEARCH_CACHE_TTL = 14 * 24 * 3600
+SEARCH_EMPTY_TTL = 24 * 3600  # Queries that returned no results
+
+# Keywords in result snippets that point to a building type
+EVIDENCE_KEYWORDS = {
+    "residential": ["apartment", "apartments", "condo", "condominium", "for rent", "bedroom", "residences", "townhouse", "homes for sale"],
+    "commercial-office": ["office space", "office building", "suite", "coworking", "corporate", "headquarters", "class a"],
+    "commercial-hotel": ["hotel", "motel", "inn", "resort", "book a room", "check-in"],
+    "commercial-medical": ["hospital", "medical center", "clinic", "healthcare", "urgent care", "physician"],
+    "commercial-retail": ["store", "shop", "restaurant", "retail", "mall", "bank"],
+    "commercial-warehouse": ["warehouse", "distribution center", "industrial", "logistics"],
+}
+
+# Minimum keyword hits, and lead over the runner-up, for evidence to count as clear
+EVIDENCE_MIN_HITS = 2
+EVIDENCE_MIN_RATIO = 2.0
+
 
 class SearchService:
     """Service to perform web searches for building classification context."""
@@ -24,11 +50,28 @@ class SearchService:
         "hospital medical"
     ]
 
+    # Adaptive mode: the six suffixes consolidated into two OR queries, sent
+    # only when the plain address query gives no clear answer
+    GROUPED_QUERIES = [
+        ("rent / for lease / apartments", 'rent OR "for lease" OR apartments'),
+        ("office space / hotel / hospital medical", '"office space" OR hotel OR hospital OR medical'),
+    ]
+
     def __init__(
         self,
         api_key: Optional[str] = None,
-        search_engine_id: Optional[str] = None
+        search_engine_id: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[SQLiteCache] = None,
+        mode: Optional[str] = None
     ):
+        # Pooled client injected at startup; falls back to a per-call client
+        self.http_client = http_client
+        # Persistent per-query result cache (optional)
+        self.cache = cache
+        # "adaptive" (1-3 queries per address) or "full" (all six suffixes)
+        self.mode = (mode or os.getenv("SEARCH_MODE", "adaptive")).lower()
+        self.api_calls = 0
         self.api_key = api_key or os.getenv("GOOGLE_SEARCH_API_KEY")
         self.search_engine_id = search_engine_id or os.getenv("GOOGLE_SEARCH_ENGINE_ID")
 
@@ -39,7 +82,12 @@ class SearchService:
 
     async def search_address(self, address: str) -> Dict[str, List[str]]:
         """
-        Perform multiple searches for an address to gather context.
+        Perform searches for an address to gather context.
+
+        In "adaptive" mode a single plain address query is sent first; the
+        two consolidated suffix queries only follow if its results don't
+        clearly point to one building type. "full" mode sends one query per
+        SEARCH_SUFFIXES entry. Every query goes through the result cache.
 
         Args:
             address: Full address string
@@ -51,31 +99,107 @@ class SearchService:
             logger.warning("Search service not configured, skipping searches")
             return {}
 
+        if self.mode == "full":
+            queries = [(suffix, f"{address} {suffix}") for suffix in self.SEARCH_SUFFIXES]
+            return await self._run_queries(queries)
+
+        results = await self._run_queries([("address", address)])
+        if self.infer_building_type(results):
+            return results
+
+        results.update(await self._run_queries([
+            (label, f"{address} {terms}") for label, terms in self.GROUPED_QUERIES
+        ]))
+        return results
+
+    async def _run_queries(self, queries: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """
+        Run labelled queries concurrently, serving repeats from the cache.
+
+        Args:
+            queries: List of (search_type, query) pairs
+
+        Returns:
+            Dictionary mapping search type to list of result snippets
+        """
         results: Dict[str, List[str]] = {}
 
-        async with httpx.AsyncClient() as client:
+        async with client_session(self.http_client) as client:
             tasks = []
-            for suffix in self.SEARCH_SUFFIXES:
-                query = f"{address} {suffix}"
-                tasks.append(self._perform_search(client, query, suffix))
+            for search_type, query in queries:
+                tasks.append(self._cached_search(client, query, search_type))
 
             search_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            for suffix, result in zip(self.SEARCH_SUFFIXES, search_results):
+            for (search_type, _), result in zip(queries, search_results):
                 if isinstance(result, list):
-                    results[suffix] = result
+                    results[search_type] = result
                 elif isinstance(result, Exception):
-                    logger.error(f"Search error for '{suffix}': {result}")
-                    results[suffix] = []
+                    logger.error(f"Search error for '{search_type}': {result}")
+                    results[search_type] = []
 
         return results
 
-    async def _perform_search(
+    async def _cached_search(
         self,
         client: httpx.AsyncClient,
         query: str,
         search_type: str
     ) -> List[str]:
+        """Perform a search unless a fresh result for the same query is cached."""
+        cache_key = query.lower().strip()
+        if self.cache is not None:
+            cached = await executor.run_io(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        snippets = await self._perform_search(client, query, search_type)
+        if snippets is None:
+            # Failed request (rate limit, error status): don't cache
+            return []
+
+        if self.cache is not None:
+            ttl = SEARCH_CACHE_TTL if snippets else SEARCH_EMPTY_TTL
+            await executor.run_io(self.cache.set, cache_key, snippets, ttl=ttl)
+        return snippets
+
+    @staticmethod
+    def infer_building_type(search_results: Dict[str, List[str]]) -> Optional[str]:
+        """
+        Infer a building type from search snippets when the evidence is clear.
+
+        Args:
+            search_results: Dictionary of search results
+
+        Returns:
+            A BuildingType value (e.g. "commercial-hotel"), or None if the
+            snippets don't clearly favour one type
+        """
+        text = " ".join(
+            snippet for snippets in search_results.values() for snippet in snippets
+        ).lower()
+        if not text:
+            return None
+
+        scores = {
+            building_type: sum(
+                len(re.findall(rf"\b{re.escape(keyword)}\b", text)) for keyword in keywords
+            )
+            for building_type, keywords in EVIDENCE_KEYWORDS.items()
+        }
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best_type, best), (_, runner_up) = ranked[0], ranked[1]
+
+        if best >= EVIDENCE_MIN_HITS and best >= EVIDENCE_MIN_RATIO * runner_up:
+            return best_type
+        return None
+
+    async def _perform_search(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        search_type: str
+    ) -> Optional[List[str]]:
         """
         Perform a single search query.
 
@@ -85,18 +209,28 @@ class SearchService:
             search_type: Type of search (for logging)
 
         Returns:
-            List of result snippets
+            List of result snippets, or None if the request failed
         """
         try:
-            response = await client.get(
-                self.BASE_URL,
-                params={
-                    "key": self.api_key,
-                    "cx": self.search_engine_id,
-                    "q": query,
-                    "num": 3  # Get top 3 results per query
-                },
-                timeout=15.0
+            async def send() -> httpx.Response:
+                self.api_calls += 1
+                async with concurrency_limits.search:
+                    response = await client.get(
+                        self.BASE_URL,
+                        params={
+                            "key": self.api_key,
+                            "cx": self.search_engine_id,
+                            "q": query,
+                            "num": 3  # Get top 3 results per query
+                        },
+                        timeout=15.0
+                    )
+                return raise_for_transient(response)
+
+            # 429s slow the shared governor down and are re-sent, not dropped;
+            # timeouts and 5xx are retried with backoff behind a breaker
+            response = await resilience.call(
+                "search", lambda: quota_governor.request("search", send)
             )
 
             if response.status_code == 200:
@@ -113,12 +247,12 @@ class SearchService:
                 return snippets
 
             elif response.status_code == 429:
-                logger.warning("Search API rate limit reached")
-                return []
+                logger.warning("Search API rate limit reached after retries")
+                return None
 
             else:
                 logger.warning(f"Search failed: {response.status_code}")
-                return []
+                return None
 
         except Exception as e:
             logger.error(f"Search error: {e}")
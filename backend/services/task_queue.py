@@ -0,0 +1,247 @@
+"""Address-level task queue shared by the API and worker processes."""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import logging
+
+from services.concurrency import env_int
+
+logger = logging.getLogger(__name__)
+
+# A claimed address not completed within this many seconds (worker crashed
+# or was killed) goes back to the queue
+DEFAULT_TASK_LEASE_SECONDS = 300
+# Claims of one task (failures and expired leases) before it is given up on
+DEFAULT_TASK_MAX_ATTEMPTS = 3
+
+
+class TaskQueue:
+    """
+    SQLite-backed queue with one task per job address.
+
+    The API enqueues every address of a job; worker processes `claim()`
+    tasks under a lease, `renew()` it while they work and `complete()` the
+    task, or `fail()` it to retry. Claiming runs in an IMMEDIATE
+    transaction, so each task goes to exactly one worker even with many
+    processes on the same database file. Once a lease expires the task may
+    be reclaimed, and the previous holder's updates are ignored. A task
+    claimed more than `max_attempts` times must be given up on (completed
+    with an error result) by its claimer. All methods are blocking; call
+    them through the executor.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds or float(
+            os.getenv("TASK_LEASE_SECONDS", DEFAULT_TASK_LEASE_SECONDS)
+        )
+        self.max_attempts = max_attempts or env_int("TASK_MAX_ATTEMPTS", DEFAULT_TASK_MAX_ATTEMPTS)
+
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30.0, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    enqueued_at REAL NOT NULL,
+                    PRIMARY KEY (job_id, idx)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (status, enqueued_at, idx)"
+            )
+
+    def enqueue(self, job_id: str, count: int) -> None:
+        """
+        Queue addresses 0..count-1 of a job.
+
+        Args:
+            job_id: Job ID
+            count: Number of addresses in the job
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (job_id, idx, status, enqueued_at) "
+                    "VALUES (?, ?, 'queued', ?)",
+                    ((job_id, index, now) for index in range(count))
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Claim the oldest queued (or lease-expired) task.
+
+        Args:
+            worker_id: Name of the claiming worker (for stats and logs)
+
+        Returns:
+            (job_id, address index, attempts including this claim), or None
+            when the queue is empty
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT job_id, idx, status, attempts FROM tasks "
+                    "WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY enqueued_at, idx LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'running', worker = ?, lease_until = ?, "
+                        "attempts = attempts + 1 WHERE job_id = ? AND idx = ?",
+                        (worker_id, now + self.lease_seconds, row[0], row[1])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        if row[2] == "running":
+            logger.warning(f"Task {row[0]}/{row[1]} lease expired, reclaimed by {worker_id}")
+        return row[0], row[1], row[3] + 1
+
+    def renew(self, job_id: str, index: int, worker_id: str) -> bool:
+        """
+        Extend the lease of a task the worker is still processing.
+
+        Returns:
+            False if the worker no longer holds the task (its lease expired
+            and another worker reclaimed it)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_until = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running' AND worker = ?",
+                (time.time() + self.lease_seconds, job_id, index, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def fail(self, job_id: str, index: int, worker_id: str) -> Optional[bool]:
+        """
+        Record a failed attempt at a claimed task.
+
+        Returns:
+            True if the task was queued again for another attempt; False if
+            it used up `max_attempts` and the caller should give up on it;
+            None if the worker no longer holds the task
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT attempts FROM tasks "
+                    "WHERE job_id = ? AND idx = ? AND status = 'running' AND worker = ?",
+                    (job_id, index, worker_id)
+                ).fetchone()
+                if row is not None and row[0] < self.max_attempts:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'queued', worker = NULL, lease_until = NULL "
+                        "WHERE job_id = ? AND idx = ?",
+                        (job_id, index)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0] < self.max_attempts
+
+    def complete(self, job_id: str, index: int, worker_id: Optional[str] = None) -> int:
+        """
+        Mark a task done.
+
+        Args:
+            job_id: Job ID
+            index: Input index of the address
+            worker_id: Only complete the task while this worker holds it
+
+        Returns:
+            Tasks of the job not yet done, counted in the same transaction
+            so exactly one worker sees 0 and finalizes the job; -1 if the
+            task was already done or the worker no longer holds it
+        """
+        holder = " AND worker = ?" if worker_id is not None else ""
+        params = (job_id, index) + ((worker_id,) if worker_id is not None else ())
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "UPDATE tasks SET status = 'done', lease_until = NULL "
+                    f"WHERE job_id = ? AND idx = ? AND status != 'done'{holder}",
+                    params
+                )
+                remaining = self._conn.execute(
+                    "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status != 'done'",
+                    (job_id,)
+                ).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return remaining if cursor.rowcount else -1
+
+    def release(self, job_id: str, index: int, worker_id: str) -> None:
+        """Put a task the worker holds back in the queue (e.g. when it stops)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = 'queued', worker = NULL, lease_until = NULL "
+                "WHERE job_id = ? AND idx = ? AND status = 'running' AND worker = ?",
+                (job_id, index, worker_id)
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get task counts by status and the number of active workers."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+            ).fetchall()
+            workers = self._conn.execute(
+                "SELECT COUNT(DISTINCT worker) FROM tasks WHERE status = 'running' AND lease_until >= ?",
+                (time.time(),)
+            ).fetchone()[0]
+        counts = dict(rows)
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "active_workers": workers,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,22 +1,226 @@
 """Service for analyzing building images using OpenAI Vision API."""
 
 import os
+import asyncio
 import base64
+import io
+import math
+import hashlib
 import json
 import re
-from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
+import numpy as np
 from openai import AsyncOpenAI
-
-from models import VisionAnalysisResult, BuildingType, Confidence
+from PIL import Image, ImageDraw
+
+from models import (
+    VisionAnalysisResult, BuildingType, Confidence, ImageDetail, TokenUsage, VisionOptions
+)
+from services.cache_store import LRUCache, SQLiteCache
+from services.concurrency import concurrency_limits
+from services.executor import executor
+from services.facade_analyzer import estimate_facade
+from services.quota_governor import quota_governor
+from services.resilience import OPENAI_TIMEOUT, resilience
 
 logger = logging.getLogger(__name__)
 
+# In-memory image data as produced by the fetch pipeline
+ImageBuffer = Union[bytes, memoryview]
+
+# Entries kept in the in-memory tier of the analysis cache
+VISION_MEMORY_CACHE_SIZE = 512
+# Persistent analysis cache lifetime in seconds
+VISION_CACHE_TTL = 90 * 24 * 3600
+
+# Token estimates for quota pacing (prompt text, and per image)
+PROMPT_TOKEN_ESTIMATE = 800
+IMAGE_TOKENS_BASE = 85  # the whole cost at detail=low
+IMAGE_TOKENS_PER_TILE = 170  # per 512px tile at detail=high
+MAX_COMPLETION_TOKENS = 500
+
+# Re-encode quality when an image is resized or cropped without an explicit setting
+DEFAULT_VISION_JPEG_QUALITY = 85
+
+# gpt-4o-mini bills images at ~33x the tokens of gpt-4o (same price per image)
+IMAGE_TOKEN_SCALE = {"gpt-4o-mini": 2833 / 85}
+
+# Cascade defaults: first pass model/detail, and which confidences escalate
+DEFAULT_FIRST_PASS_DETAIL = ImageDetail.LOW
+DEFAULT_ESCALATE_CONFIDENCE = "low"
+
+# Local facade analysis: certainty needed to add it to the prompt as a prior,
+# and to skip the vision call entirely (only with clear search evidence).
+# Both are off (> 1) until the certainty is calibrated against vision
+# results, e.g. the local_* columns of tools/compare_mosaic.py; until then
+# the estimate is only recorded next to the model's as an independent check
+DEFAULT_FACADE_PRIOR_CERTAINTY = 1.01
+DEFAULT_FACADE_SKIP_CERTAINTY = 1.01
+# A skip also needs this many analyzed views agreeing within this many WWR points
+FACADE_SKIP_MIN_VIEWS = 2
+FACADE_SKIP_MAX_SPREAD = 10.0
+
+# Mosaic mode: separator width and label banner height in pixels
+MOSAIC_BORDER = 4
+MOSAIC_LABEL_HEIGHT = 18
+
+
+JPEG_DATA_URL_PREFIX = b"data:image/jpeg;base64,"
+
+
+def encode_images(images: Sequence[ImageBuffer]) -> List[str]:
+    """
+    Build JPEG data URLs straight from image buffers.
+
+    The prefix is joined to the base64 bytes before the single ASCII decode,
+    so each image is copied once into its URL string rather than through
+    intermediate strings. Blocking; run on the executor.
+    """
+    return [
+        (JPEG_DATA_URL_PREFIX + base64.b64encode(data)).decode("ascii")
+        for data in images
+    ]
+
+
+def estimate_image_tokens(width: int, height: int, detail: ImageDetail) -> int:
+    """
+    Estimate the prompt tokens OpenAI charges for one image.
+
+    High detail scales the image to fit 2048x2048, then its shortest side
+    down to 768, and charges per 512px tile on top of the base cost.
+    """
+    if detail == ImageDetail.LOW:
+        return IMAGE_TOKENS_BASE
+
+    scale = min(1.0, 2048 / max(width, height))
+    scale *= min(1.0, 768 / (min(width, height) * scale))
+    tiles = math.ceil(width * scale / 512) * math.ceil(height * scale / 512)
+    return IMAGE_TOKENS_BASE + IMAGE_TOKENS_PER_TILE * tiles
+
+
+def preprocess_image(
+    data: ImageBuffer,
+    max_size: int,
+    crop: float = 1.0,
+    jpeg_quality: Optional[int] = None
+) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    Prepare one image for the vision model.
+
+    Crops to the central `crop` fraction (the facade is centred by the
+    heading planner), downscales so the longest side is at most `max_size`,
+    and re-encodes as JPEG. Images needing none of that are passed through
+    without re-encoding. Blocking; run on the executor.
+
+    Args:
+        data: Original JPEG data
+        max_size: Longest side in pixels
+        crop: Fraction of width and height to keep (1.0 = no crop)
+        jpeg_quality: Re-encode quality (None: DEFAULT_VISION_JPEG_QUALITY
+            when the image changes, otherwise no re-encode)
+
+    Returns:
+        Tuple of (JPEG bytes, (width, height))
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        width, height = img.size
+        if crop >= 1 and max(width, height) <= max_size and jpeg_quality is None:
+            return bytes(data), (width, height)
+
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if crop < 1:
+            keep_w, keep_h = round(width * crop), round(height * crop)
+            left, top = (width - keep_w) // 2, (height - keep_h) // 2
+            img = img.crop((left, top, left + keep_w, top + keep_h))
+        if max(img.size) > max_size:
+            img.thumbnail((max_size, max_size))
+
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=jpeg_quality or DEFAULT_VISION_JPEG_QUALITY)
+        return buffer.getvalue(), img.size
+
+
+def build_mosaic(
+    images: Sequence[bytes],
+    labels: Sequence[str],
+    tile_size: int,
+    crop: float = 1.0,
+    jpeg_quality: Optional[int] = None
+) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    Tile several views of a building into one labelled grid image.
+
+    Every image is centre-cropped and resized to a `tile_size` square,
+    then the tiles are laid out in a near-square grid (2 images: 1x2,
+    3-4 images: 2x2) with one reshape/transpose. Each tile gets a darkened
+    banner carrying its label, and tiles are separated by white borders.
+    Blocking; run on the executor.
+
+    Args:
+        images: JPEG data of each view
+        labels: Text drawn on each tile (e.g. "A 348deg")
+        tile_size: Side of each tile in pixels
+        crop: Fraction of width and height to keep (1.0 = no crop)
+        jpeg_quality: Output quality (None: DEFAULT_VISION_JPEG_QUALITY)
+
+    Returns:
+        Tuple of (JPEG bytes, (width, height))
+    """
+    count = len(images)
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+
+    # (rows * cols, tile, tile, 3); unused cells stay black
+    tiles = np.zeros((rows * cols, tile_size, tile_size, 3), dtype=np.uint8)
+    for i, data in enumerate(images):
+        with Image.open(io.BytesIO(data)) as img:
+            img = img.convert("RGB")
+            if crop < 1:
+                width, height = img.size
+                keep_w, keep_h = round(width * crop), round(height * crop)
+                left, top = (width - keep_w) // 2, (height - keep_h) // 2
+                img = img.crop((left, top, left + keep_w, top + keep_h))
+            tiles[i] = np.asarray(img.resize((tile_size, tile_size)))
+
+    # Label banners and borders, applied to all tiles at once
+    tiles[:, :MOSAIC_LABEL_HEIGHT] //= 3
+    tiles[:, :MOSAIC_BORDER // 2] = 255
+    tiles[:, -(MOSAIC_BORDER // 2):] = 255
+    tiles[:, :, :MOSAIC_BORDER // 2] = 255
+    tiles[:, :, -(MOSAIC_BORDER // 2):] = 255
+
+    grid = (
+        tiles.reshape(rows, cols, tile_size, tile_size, 3)
+        .transpose(0, 2, 1, 3, 4)
+        .reshape(rows * tile_size, cols * tile_size, 3)
+    )
+
+    mosaic = Image.fromarray(grid)
+    draw = ImageDraw.Draw(mosaic)
+    for i, label in enumerate(labels[:count]):
+        row, col = divmod(i, cols)
+        draw.text(
+            (col * tile_size + MOSAIC_BORDER + 2, row * tile_size + MOSAIC_BORDER),
+            label,
+            fill=(255, 255, 255)
+        )
+
+    buffer = io.BytesIO()
+    mosaic.save(buffer, format="JPEG", quality=jpeg_quality or DEFAULT_VISION_JPEG_QUALITY)
+    return buffer.getvalue(), mosaic.size
+
 
 class VisionService:
     """Service to analyze building images using OpenAI GPT-4o Vision."""
 
+    MODEL = "gpt-4o"
+
+    # Bump whenever SYSTEM_PROMPT / USER_PROMPT_TEMPLATE change meaningfully,
+    # so cached analyses from the old prompt are not reused
+    PROMPT_VERSION = "2"
+
     SYSTEM_PROMPT = """You are an expert building analyst. Your task is to analyze street-level images of buildings to determine:
 1. Building Type: Classify into specific categories
 2. Window-to-Wall Ratio (WWR): What percentage of the facade is glass/windows?
@@ -56,9 +260,53 @@ Guidelines:
 - If images are unclear or show multiple buildings, use "low" confidence
 - For misc buildings, still estimate WWR if possible, or use 0 if not applicable"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Appended to the user prompt when the local facade analysis is confident enough
+    FACADE_PRIOR_NOTE = """
+
+An automated pixel analysis of these images estimated the WWR at about {wwr}% (certainty {certainty:.2f}). Treat it as a rough prior only: it can mistake shadows, dark cladding or vehicles for glass. Base your estimate on what you see."""
+
+    # Appended to the user prompt when the views are sent as one mosaic
+    MOSAIC_PROMPT_NOTE = """
+
+The views are combined into ONE image: a grid of tiles separated by white lines, each labelled in its top-left corner with a letter and the camera heading. All tiles show the same building from different angles; judge the building from all of them together."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[SQLiteCache] = None
+    ):
         self._api_key = api_key
         self._client = None
+        # Analysis memo: in-memory LRU in front of an optional persistent tier
+        self._memory_cache = LRUCache(VISION_MEMORY_CACHE_SIZE)
+        self.cache = cache
+        # Token usage of uncached calls, per model and detail level
+        self.usage: Dict[str, Dict[str, int]] = {}
+
+        # Cascade: a cheap first pass, escalated to MODEL only when needed
+        self.first_pass_model = os.getenv("VISION_FIRST_PASS_MODEL", self.MODEL)
+        self.first_pass_detail = ImageDetail(
+            os.getenv("VISION_FIRST_PASS_DETAIL", DEFAULT_FIRST_PASS_DETAIL.value)
+        )
+        self.escalate_confidence = {
+            Confidence(value.strip())
+            for value in os.getenv("VISION_ESCALATE_CONFIDENCE", DEFAULT_ESCALATE_CONFIDENCE).split(",")
+            if value.strip()
+        }
+        self.escalate_on_disagreement = os.getenv(
+            "VISION_ESCALATE_ON_DISAGREEMENT", "true"
+        ).lower() in ("1", "true", "yes")
+        self.cascade_stats: Dict[str, int] = {"first_pass": 0, "escalated": 0}
+
+        # Local facade analysis: a prompt prior, or a replacement for the call
+        self.facade_analysis = os.getenv("FACADE_ANALYSIS", "true").lower() in ("1", "true", "yes")
+        self.facade_prior_certainty = float(
+            os.getenv("FACADE_PRIOR_MIN_CERTAINTY", DEFAULT_FACADE_PRIOR_CERTAINTY)
+        )
+        self.facade_skip_certainty = float(
+            os.getenv("FACADE_SKIP_CERTAINTY", DEFAULT_FACADE_SKIP_CERTAINTY)
+        )
+        self.facade_stats: Dict[str, int] = {"analyzed": 0, "prior_used": 0, "vision_skipped": 0}
 
     @property
     def client(self):
@@ -68,13 +316,119 @@ Guidelines:
             if not api_key:
                 logger.warning("OpenAI API key not configured")
                 return None
-            self._client = AsyncOpenAI(api_key=api_key)
+            self._client = AsyncOpenAI(
+                api_key=api_key,
+                # Retries are owned by the resilience layer and quota governor
+                max_retries=0,
+                timeout=OPENAI_TIMEOUT
+            )
         return self._client
 
-    def _encode_image(self, image_path: str) -> str:
-        """Encode an image file to base64."""
-        with open(image_path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
+    @staticmethod
+    def default_options() -> VisionOptions:
+        """Vision options from the environment (VISION_DETAIL, VISION_MAX_SIZE, ...)."""
+        quality = os.getenv("VISION_JPEG_QUALITY")
+        return VisionOptions(
+            detail=os.getenv("VISION_DETAIL", ImageDetail.HIGH.value),
+            max_size=int(os.getenv("VISION_MAX_SIZE", 640)),
+            crop=float(os.getenv("VISION_CROP", 1.0)),
+            jpeg_quality=int(quality) if quality else None,
+            mosaic=os.getenv("VISION_MOSAIC", "false").lower() in ("1", "true", "yes"),
+            cascade=os.getenv("VISION_CASCADE", "true").lower() in ("1", "true", "yes")
+        )
+
+    def _cache_key(
+        self,
+        images: Sequence[ImageBuffer],
+        search_context: str,
+        options: VisionOptions,
+        labels: Sequence[str] = (),
+        model: Optional[str] = None
+    ) -> str:
+        """Hash the inputs that determine an analysis."""
+        digest = hashlib.sha256()
+        digest.update(f"{model or self.MODEL}|{self.PROMPT_VERSION}|".encode())
+        # The first pass detail is routing, not an input of this request
+        digest.update(options.model_dump_json(exclude={"first_pass_detail"}).encode())
+        if options.mosaic:
+            # Labels are drawn into the mosaic
+            digest.update("|".join(labels).encode())
+        for image in images:
+            digest.update(hashlib.sha256(image).digest())
+        digest.update(search_context.encode())
+        return digest.hexdigest()
+
+    async def _get_cached(self, key: str) -> Optional[VisionAnalysisResult]:
+        """Look up a memoized analysis in the memory tier, then the persistent tier."""
+        result = self._memory_cache.get(key)
+        if result is not None:
+            return result
+
+        if self.cache is not None:
+            stored = await executor.run_io(self.cache.get, key)
+            if stored is not None:
+                result = VisionAnalysisResult.model_validate(stored)
+                self._memory_cache.set(key, result)
+                return result
+        return None
+
+    async def _set_cached(self, key: str, result: VisionAnalysisResult) -> None:
+        """Memoize a successful analysis in both tiers."""
+        # Cache hits cost nothing, so they report no usage
+        result = result.model_copy(update={"usage": None})
+        self._memory_cache.set(key, result)
+        if self.cache is not None:
+            await executor.run_io(self.cache.set, key, result.model_dump(mode="json"), ttl=VISION_CACHE_TTL)
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss counters for both cache tiers."""
+        stats = {"memory": self._memory_cache.get_stats()}
+        if self.cache is not None:
+            stats["persistent"] = self.cache.get_stats()
+        return stats
+
+    def _record_usage(self, model: str, detail: ImageDetail, images: int, usage: TokenUsage) -> None:
+        totals = self.usage.setdefault(
+            f"{model}/{detail.value}",
+            {"calls": 0, "images": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        )
+        totals["calls"] += 1
+        totals["images"] += images
+        totals["prompt_tokens"] += usage.prompt_tokens
+        totals["completion_tokens"] += usage.completion_tokens
+
+    def get_usage_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get token usage of uncached vision calls, per model/detail level."""
+        return self.usage
+
+    def get_cascade_stats(self) -> Dict[str, float]:
+        """Get first-pass and escalation counts (per reason) and the escalation rate."""
+        stats = dict(self.cascade_stats)
+        first_pass = stats["first_pass"]
+        stats["escalation_rate"] = round(stats["escalated"] / first_pass, 3) if first_pass else 0.0
+        return stats
+
+    def get_facade_stats(self) -> Dict[str, int]:
+        """Get local facade analysis counts (analyzed, used as prior, vision skipped)."""
+        return self.facade_stats
+
+    def _escalation_reason(
+        self,
+        result: VisionAnalysisResult,
+        search_evidence: Optional[str]
+    ) -> Optional[str]:
+        """Why a first-pass result needs the full model, or None if it can stand."""
+        if result.parse_failed:
+            return "parse_failed"
+        if result.confidence in self.escalate_confidence:
+            return f"confidence_{result.confidence.value}"
+        if (
+            self.escalate_on_disagreement
+            and search_evidence
+            and result.building_type.value != search_evidence
+        ):
+            return "search_disagreement"
+        return None
 
     def _parse_response(self, response_text: str) -> VisionAnalysisResult:
         """
@@ -87,7 +441,7 @@ Guidelines:
             VisionAnalysisResult object
         """
         # Clean up the response - remove markdown code blocks if present
-        cleaned = response_text.strip()
+        cleaned = (response_text or "").strip()
         if cleaned.startswith("```"):
             # Remove markdown code block markers
             cleaned = re.sub(r"^```(?:json)?\n?", "", cleaned)
@@ -130,7 +484,8 @@ Guidelines:
                 reasoning=reasoning
             )
 
-        except json.JSONDecodeError as e:
+        except (ValueError, TypeError, AttributeError) as e:
+            # Not JSON, or JSON of the wrong shape (e.g. a non-numeric WWR)
             logger.error(f"Failed to parse JSON response: {e}")
             logger.error(f"Response was: {response_text}")
             # Return a default result with low confidence
@@ -138,25 +493,53 @@ Guidelines:
                 building_type=BuildingType.MISC,
                 wwr_estimate=0,
                 confidence=Confidence.LOW,
-                reasoning=f"Failed to parse model response: {str(e)}"
+                reasoning=f"Failed to parse model response: {str(e)}",
+                parse_failed=True
             )
 
     async def analyze_building(
         self,
-        image_paths: List[str],
+        images: Sequence[ImageBuffer],
         address: str,
-        search_context: str = ""
+        search_context: str = "",
+        options: Optional[VisionOptions] = None,
+        labels: Optional[Sequence[str]] = None,
+        search_evidence: Optional[str] = None
     ) -> VisionAnalysisResult:
         """
         Analyze building images using OpenAI Vision.
 
+        With `options.cascade` on, a cheap first pass (VISION_FIRST_PASS_MODEL
+        at VISION_FIRST_PASS_DETAIL) runs first; it is escalated to MODEL with
+        the job's own options only when the result is unparseable, its
+        confidence is in VISION_ESCALATE_CONFIDENCE, or it contradicts the
+        building type the search snippets clearly point to.
+
+        The local facade analyzer runs first and its estimate is recorded on
+        the result. Its WWR is added to the prompt as a prior when its
+        certainty reaches FACADE_PRIOR_MIN_CERTAINTY (off by default); at
+        FACADE_SKIP_CERTAINTY (also off by default), with clear search
+        evidence for the type and at least FACADE_SKIP_MIN_VIEWS views that
+        agree, no model is called at all. The type then comes from search
+        keywords alone, which never yield "mixed".
+
         Args:
-            image_paths: List of paths to street-level images
+            images: JPEG data of the street-level images, in memory
             address: The building address
             search_context: Formatted search results for context
+            options: Detail level, preprocessing, mosaic and cascade mode
+                (defaults from env)
+            labels: Per-image captions for mosaic tiles (e.g. headings);
+                tiles are lettered A, B, ... either way
+            search_evidence: Building type inferred from search results
+                (SearchService.infer_building_type), if any
 
         Returns:
             VisionAnalysisResult with classification and WWR estimate
+
+        Raises:
+            CircuitOpenError: If the OpenAI breaker is open
+            Exception: The OpenAI error once retries are exhausted
         """
         if not self.client:
             logger.error("OpenAI client not initialized")
@@ -167,7 +550,7 @@ Guidelines:
                 reasoning="OpenAI API not configured"
             )
 
-        if not image_paths:
+        if not images:
             logger.warning(f"No images provided for {address}")
             return VisionAnalysisResult(
                 building_type=BuildingType.MISC,
@@ -176,49 +559,212 @@ Guidelines:
                 reasoning="No street view images available"
             )
 
+        context = search_context if search_context else "No search results available."
+        options = options or self.default_options()
+        labels = [
+            f"{chr(ord('A') + i)} {label}".rstrip()
+            for i, label in enumerate(labels or [""] * len(images))
+        ]
+
+        facade = None
+        prompt_note = ""
+        if self.facade_analysis:
+            facade = await executor.run_cpu(estimate_facade, [bytes(data) for data in images])
+            self.facade_stats["analyzed"] += facade is not None
+
+        if (
+            facade is not None
+            and search_evidence
+            and facade.certainty >= self.facade_skip_certainty
+            and facade.images >= FACADE_SKIP_MIN_VIEWS
+            and facade.wwr_spread <= FACADE_SKIP_MAX_SPREAD
+        ):
+            # Clear search evidence for the type and a confident local WWR: no model call
+            self.facade_stats["vision_skipped"] += 1
+            logger.info(f"Skipping vision for {address}: local WWR {facade.wwr_estimate}%")
+            return VisionAnalysisResult(
+                building_type=BuildingType(search_evidence),
+                wwr_estimate=facade.wwr_estimate,
+                confidence=Confidence.MEDIUM,
+                reasoning=(
+                    f"Type from web search evidence; WWR from local facade analysis "
+                    f"(certainty {facade.certainty:.2f}), vision model not called"
+                ),
+                facade_estimate=facade,
+                vision_skipped=True
+            )
+
+        if facade is not None and facade.certainty >= self.facade_prior_certainty:
+            self.facade_stats["prior_used"] += 1
+            prompt_note = self.FACADE_PRIOR_NOTE.format(
+                wwr=facade.wwr_estimate, certainty=facade.certainty
+            )
+
+        result = await self._route(
+            images, labels, address, context, options, prompt_note, search_evidence
+        )
+        return result.model_copy(update={"facade_estimate": facade})
+
+    async def _route(
+        self,
+        images: Sequence[ImageBuffer],
+        labels: List[str],
+        address: str,
+        context: str,
+        options: VisionOptions,
+        prompt_note: str,
+        search_evidence: Optional[str]
+    ) -> VisionAnalysisResult:
+        """Run the cascade: first pass, escalating to MODEL when needed."""
+        first_options = options.model_copy(
+            update={"detail": options.first_pass_detail or self.first_pass_detail}
+        )
+        if not options.cascade or (
+            self.first_pass_model == self.MODEL and first_options == options
+        ):
+            return await self._analyze(
+                images, labels, address, context, options, self.MODEL, prompt_note
+            )
+
+        first = await self._analyze(
+            images, labels, address, context, first_options, self.first_pass_model, prompt_note
+        )
+        self.cascade_stats["first_pass"] += 1
+        reason = self._escalation_reason(first, search_evidence)
+        if reason is None:
+            return first
+
+        self.cascade_stats["escalated"] += 1
+        self.cascade_stats[reason] = self.cascade_stats.get(reason, 0) + 1
+        logger.info(f"Escalating {address} to {self.MODEL} ({reason})")
+
+        result = await self._analyze(
+            images, labels, address, context, options, self.MODEL, prompt_note
+        )
+        usage = result.usage
+        if first.usage is not None:
+            # Both passes were paid for
+            usage = usage or TokenUsage()
+            usage = TokenUsage(
+                prompt_tokens=first.usage.prompt_tokens + usage.prompt_tokens,
+                completion_tokens=first.usage.completion_tokens + usage.completion_tokens,
+                total_tokens=first.usage.total_tokens + usage.total_tokens
+            )
+        # Copy: the result may be the cached instance
+        return result.model_copy(update={"escalation_reason": reason, "usage": usage})
+
+    async def _analyze(
+        self,
+        images: Sequence[ImageBuffer],
+        labels: List[str],
+        address: str,
+        context: str,
+        options: VisionOptions,
+        model: str,
+        prompt_note: str = ""
+    ) -> VisionAnalysisResult:
+        """
+        Run one (memoized) vision request with a given model and options.
+
+        Args:
+            images: JPEG data of the street-level images
+            labels: Lettered mosaic tile captions
+            address: The building address
+            context: Search context text for the prompt
+            options: Detail level, preprocessing and mosaic mode
+            model: OpenAI model name
+            prompt_note: Extra prompt text (e.g. the local WWR prior)
+
+        Returns:
+            VisionAnalysisResult with classification and WWR estimate
+
+        Raises:
+            CircuitOpenError: If the OpenAI breaker is open
+            Exception: The OpenAI error once retries are exhausted
+        """
+        use_mosaic = options.mosaic and len(images) > 1
+        cache_key = self._cache_key(images, context + prompt_note, options, labels, model)
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
+            logger.info(f"Vision cache hit for {address} ({model})")
+            # Copy: entries cached before these fields existed lack them
+            return cached.model_copy(update={"vision_model": model, "vision_detail": options.detail})
+
+        # bytes() only copies memoryviews, which can't be sent to a process pool
+        if use_mosaic:
+            prepared = [await executor.run_cpu(
+                build_mosaic, [bytes(data) for data in images], labels,
+                options.max_size, options.crop, options.jpeg_quality
+            )]
+        else:
+            prepared = await asyncio.gather(*(
+                executor.run_cpu(
+                    preprocess_image, bytes(data), options.max_size, options.crop, options.jpeg_quality
+                )
+                for data in images
+            ))
+        images = [data for data, _ in prepared]
+        image_tokens = round(IMAGE_TOKEN_SCALE.get(model, 1) * sum(
+            estimate_image_tokens(width, height, options.detail)
+            for _, (width, height) in prepared
+        ))
+
         # Build the message content with images
         content = []
 
         # Add text prompt
         user_prompt = self.USER_PROMPT_TEMPLATE.format(
             address=address,
-            search_context=search_context if search_context else "No search results available."
+            search_context=context
         )
+        if use_mosaic:
+            user_prompt += self.MOSAIC_PROMPT_NOTE
+        user_prompt += prompt_note
         content.append({"type": "text", "text": user_prompt})
 
         # Add images
-        for image_path in image_paths:
-            if Path(image_path).exists():
-                base64_image = self._encode_image(image_path)
-                content.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{base64_image}",
-                        "detail": "high"
-                    }
-                })
-
-        try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT},
-                    {"role": "user", "content": content}
-                ],
-                max_tokens=500,
-                temperature=0.3  # Lower temperature for more consistent outputs
-            )
-
-            response_text = response.choices[0].message.content
-            logger.info(f"Vision API response for {address}: {response_text}")
-
-            return self._parse_response(response_text)
+        # Thread, not process: shipping the buffers to a worker would copy them
+        for data_url in await executor.run_io(encode_images, images):
+            content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": data_url,
+                    "detail": options.detail.value
+                }
+            })
+
+        async def create():
+            async with concurrency_limits.openai:
+                return await self.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": self.SYSTEM_PROMPT},
+                        {"role": "user", "content": content}
+                    ],
+                    max_tokens=MAX_COMPLETION_TOKENS,
+                    temperature=0.3  # Lower temperature for more consistent outputs
+                )
+
+        # API errors (an open breaker, exhausted retries) propagate so the
+        # address is recorded as failed, not as a low-confidence analysis
+        estimated_tokens = PROMPT_TOKEN_ESTIMATE + image_tokens + MAX_COMPLETION_TOKENS
+        response = await resilience.call(
+            "openai", lambda: quota_governor.openai_call(create, estimated_tokens)
+        )
 
-        except Exception as e:
-            logger.error(f"Error calling OpenAI Vision API: {e}")
-            return VisionAnalysisResult(
-                building_type=BuildingType.MISC,
-                wwr_estimate=0,
-                confidence=Confidence.LOW,
-                reasoning=f"API error: {str(e)}"
+        response_text = response.choices[0].message.content
+        logger.info(f"Vision API response for {address} ({model}): {response_text}")
+
+        result = self._parse_response(response_text)
+        result.vision_model = model
+        result.vision_detail = options.detail
+        if response.usage is not None:
+            result.usage = TokenUsage(
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                total_tokens=response.usage.total_tokens
             )
+            self._record_usage(model, options.detail, len(images), result.usage)
+        if not result.parse_failed:
+            await self._set_cached(cache_key, result)
+        return result
@@ -1,19 +1,52 @@
 """Service for looking up state and county from zip code."""
 
+import time
+import asyncio
 import httpx
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 import logging
 
+from services.cache_store import SQLiteCache
+from services.concurrency import concurrency_limits
+from services.executor import executor
+from services.http_clients import client_session
+from services.resilience import raise_for_transient, resilience
+from services.zip_table import ZipTable
+
 logger = logging.getLogger(__name__)
 
+# Cache lifetimes in seconds
+ZIP_CACHE_TTL = 30 * 24 * 3600  # Found ZIPs rarely change
+ZIP_NOT_FOUND_TTL = 7 * 24 * 3600  # Unknown ZIPs (404)
+ZIP_ERROR_TTL = 300  # Timeouts / upstream errors, retried soon after
+
 
 class ZipService:
-    """Service to lookup state and county from zip code using Zippopotam.us API."""
+    """
+    Service to lookup state and county from zip code.
+
+    Uses an optional offline ZipTable first and falls back to the
+    Zippopotam.us API for ZIPs the table doesn't contain.
+    """
 
     BASE_URL = "https://api.zippopotam.us/us"
 
-    def __init__(self):
-        self._cache: dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[SQLiteCache] = None,
+        table: Optional[ZipTable] = None
+    ):
+        # Pooled client injected at startup; falls back to a per-call client
+        self.http_client = http_client
+        # Persistent cache shared across restarts (optional)
+        self.cache = cache
+        # Offline reference table, answers without any network call (optional)
+        self.table = table
+        # In-process tier: zip -> ((state, county), expires_at)
+        self._cache: Dict[str, Tuple[Tuple[Optional[str], Optional[str]], float]] = {}
+        # Single-flight: concurrent lookups of one ZIP share a single request
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def lookup(self, zip_code: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -28,16 +61,74 @@ class ZipService:
         # Normalize zip code
         zip_code = zip_code.strip()[:5]
 
-        # Check cache first
-        if zip_code in self._cache:
-            return self._cache[zip_code]
+        # Offline table first, no network needed
+        if self.table is not None:
+            found = self.table.lookup(zip_code)
+            if found is not None:
+                return found
+
+        # Then the caches
+        cached = self._cache.get(zip_code)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
+        if self.cache is not None:
+            try:
+                stored = await executor.run_io(self.cache.get, zip_code)
+            except Exception as e:
+                # The disk cache is best-effort: fall through to the network
+                logger.warning(f"Zip cache read failed for {zip_code}: {e}")
+                stored = None
+            if stored is not None:
+                result, expires_at = stored
+                result = tuple(result)
+                self._cache[zip_code] = (result, expires_at)
+                return result
+
+        # Join an in-flight lookup for the same ZIP instead of sending another
+        if zip_code in self._inflight:
+            return await asyncio.shield(self._inflight[zip_code])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[zip_code] = future
+        try:
+            result, ttl = await self._fetch(zip_code)
+            await self._store(zip_code, result, ttl)
+        except BaseException as e:
+            # Joiners get the same error
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # mark retrieved; joiners re-raise it
+            else:
+                future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[zip_code]
+
+    async def _fetch(
+        self,
+        zip_code: str
+    ) -> Tuple[Tuple[Optional[str], Optional[str]], float]:
+        """
+        Fetch a ZIP from Zippopotam.
 
+        Returns:
+            Tuple of ((state_abbr, county), cache_ttl_seconds)
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/{zip_code}",
-                    timeout=10.0
-                )
+            async with client_session(self.http_client) as client:
+                async def send() -> httpx.Response:
+                    async with concurrency_limits.zippopotam:
+                        response = await client.get(
+                            f"{self.BASE_URL}/{zip_code}",
+                            timeout=10.0
+                        )
+                    return raise_for_transient(response)
+
+                response = await resilience.call("zippopotam", send)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -51,17 +142,72 @@ class ZipService:
                         # For now, we'll just return state
                         county = places[0].get("place name", "")
 
-                    result = (state, county)
-                    self._cache[zip_code] = result
-                    return result
+                    return (state, county), ZIP_CACHE_TTL
+                elif response.status_code == 404:
+                    logger.warning(f"Zip lookup failed for {zip_code}: {response.status_code}")
+                    return (None, None), ZIP_NOT_FOUND_TTL
                 else:
                     logger.warning(f"Zip lookup failed for {zip_code}: {response.status_code}")
-                    self._cache[zip_code] = (None, None)
-                    return (None, None)
+                    return (None, None), ZIP_ERROR_TTL
 
         except Exception as e:
             logger.error(f"Error looking up zip code {zip_code}: {e}")
-            return (None, None)
+            return (None, None), ZIP_ERROR_TTL
+
+    async def _store(
+        self,
+        zip_code: str,
+        result: Tuple[Optional[str], Optional[str]],
+        ttl: float
+    ) -> None:
+        """Store a lookup result (including negative results) in both cache tiers."""
+        expires_at = time.time() + ttl
+        self._cache[zip_code] = (result, expires_at)
+        if self.cache is not None:
+            try:
+                await executor.run_io(
+                    self.cache.set, zip_code, [list(result), expires_at], ttl=ttl
+                )
+            except Exception as e:
+                # The in-memory tier still has it; the next process refetches
+                logger.warning(f"Zip cache write failed for {zip_code}: {e}")
+
+    async def prefetch(self, zip_codes: Iterable[str]) -> None:
+        """
+        Resolve every unique ZIP up front so per-address lookups hit the cache.
+
+        Args:
+            zip_codes: ZIP codes for a job (duplicates are fine)
+        """
+        unique = {z.strip()[:5] for z in zip_codes if z and z.strip()}
+        if not unique:
+            return
+        results = await asyncio.gather(
+            *(self.lookup(z) for z in unique), return_exceptions=True
+        )
+        for zip_code, result in zip(unique, results):
+            # Addresses look their ZIP up again when they are processed
+            if isinstance(result, Exception):
+                logger.warning(f"Zip prefetch failed for {zip_code}: {result}")
+        logger.info(f"Prefetched {len(unique)} unique zip codes")
+
+    @staticmethod
+    def format_address(
+        street_number: str,
+        street_name: str,
+        zip_code: str,
+        state: Optional[str],
+        city: Optional[str]
+    ) -> str:
+        """Format a full address string from its parts and a ZIP lookup result."""
+        parts = [f"{street_number} {street_name}"]
+        if city:
+            parts.append(city)
+        if state:
+            parts.append(state)
+        parts.append(zip_code)
+
+        return ", ".join(parts)
 
     async def get_full_address(
         self,
@@ -81,12 +227,4 @@ class ZipService:
             Formatted address string
         """
         state, city = await self.lookup(zip_code)
-
-        parts = [f"{street_number} {street_name}"]
-        if city:
-            parts.append(city)
-        if state:
-            parts.append(state)
-        parts.append(zip_code)
-
-        return ", ".join(parts)
+        return self.format_address(street_number, street_name, zip_code, state, city)
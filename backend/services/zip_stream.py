@@ -0,0 +1,76 @@
+"""Streaming ZIP writer: emits archive bytes entry by entry."""
+
+import time
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+# Read size when copying files into the archive
+CHUNK_SIZE = 64 * 1024
+
+# (archive name, file path or bytes, zipfile.ZIP_STORED / ZIP_DEFLATED)
+ZipEntry = Tuple[str, Union[str, Path, bytes], int]
+
+
+class _StreamSink:
+    """Write-only, unseekable file object that collects bytes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    """
+    Build a ZIP archive incrementally.
+
+    Entries are consumed lazily and their bytes yielded as soon as they are
+    written, so memory stays bounded by one chunk (or one in-memory entry)
+    regardless of archive size. Because the sink is unseekable, zipfile
+    writes sizes and CRCs in data descriptors after each entry.
+
+    Args:
+        entries: Iterable of (arcname, source, compress_type); `source` is a
+            file path or bytes. Use ZIP_STORED for already-compressed data
+            such as JPEGs.
+
+    Yields:
+        Consecutive chunks of the archive
+    """
+    sink = _StreamSink()
+    date_time = time.localtime()[:6]
+
+    with zipfile.ZipFile(sink, "w") as zf:
+        for arcname, source, compress_type in entries:
+            info = zipfile.ZipInfo(arcname, date_time=date_time)
+            info.compress_type = compress_type
+            info.external_attr = 0o644 << 16
+
+            with zf.open(info, "w") as dest:
+                if isinstance(source, bytes):
+                    dest.write(source)
+                else:
+                    with open(source, "rb") as src:
+                        while chunk := src.read(CHUNK_SIZE):
+                            dest.write(chunk)
+                            data = sink.drain()
+                            if data:
+                                yield data
+
+            data = sink.drain()
+            if data:
+                yield data
+
+    # Central directory
+    yield sink.drain()
@@ -0,0 +1,135 @@
+"""Offline US ZIP code reference table."""
+
+import csv
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Accepted header names (lowercased) for each column of a reference CSV
+ZIP_COLUMNS = ["zip", "zip_code", "zipcode", "postal code", "postal_code", "zcta", "zcta5"]
+STATE_COLUMNS = ["state", "state_abbr", "state abbreviation", "state_id", "stusps", "state_code"]
+CITY_COLUMNS = ["city", "place name", "place_name", "primary_city", "place", "county", "county_name"]
+
+
+def _find_column(fieldnames: List[str], candidates: List[str]) -> Optional[str]:
+    """Find the first header matching one of the candidate names."""
+    normalized = {name.strip().lower(): name for name in fieldnames}
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized[candidate]
+    return None
+
+
+class ZipTable:
+    """
+    Compact in-memory ZIP index built from a user-supplied CSV.
+
+    ZIPs are stored as a sorted `array('I')` with parallel arrays of indexes
+    into de-duplicated state and city string tables, so a 40k-row national
+    table costs well under a megabyte and lookups are a binary search.
+    """
+
+    def __init__(
+        self,
+        zips: array,
+        state_ids: array,
+        city_ids: array,
+        states: List[str],
+        cities: List[str]
+    ):
+        self._zips = zips
+        self._state_ids = state_ids
+        self._city_ids = city_ids
+        self._states = states
+        self._cities = cities
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._zips)
+
+    @classmethod
+    def from_csv(cls, path: Union[str, Path]) -> "ZipTable":
+        """
+        Build a table from a CSV with ZIP, state and city (or county) columns.
+
+        Args:
+            path: Path to the reference CSV
+
+        Returns:
+            ZipTable instance
+        """
+        rows: Dict[int, Tuple[str, str]] = {}
+
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or []
+            zip_col = _find_column(fieldnames, ZIP_COLUMNS)
+            state_col = _find_column(fieldnames, STATE_COLUMNS)
+            city_col = _find_column(fieldnames, CITY_COLUMNS)
+            if not zip_col or not state_col:
+                raise ValueError(f"ZIP table {path} needs ZIP and state columns, found: {fieldnames}")
+
+            for row in reader:
+                raw_zip = (row.get(zip_col) or "").strip()[:5]
+                if not raw_zip.isdigit():
+                    continue
+                # First row wins for ZIPs listed more than once
+                rows.setdefault(int(raw_zip), (
+                    (row.get(state_col) or "").strip(),
+                    (row.get(city_col) or "").strip() if city_col else ""
+                ))
+
+        zips = array("I")
+        state_ids = array("H")
+        city_ids = array("I")
+        states: List[str] = []
+        cities: List[str] = []
+        state_index: Dict[str, int] = {}
+        city_index: Dict[str, int] = {}
+
+        for zip_int in sorted(rows):
+            state, city = rows[zip_int]
+            zips.append(zip_int)
+            state_ids.append(state_index.setdefault(state, len(state_index)))
+            city_ids.append(city_index.setdefault(city, len(city_index)))
+
+        states = list(state_index)
+        cities = list(city_index)
+
+        logger.info(f"Loaded ZIP table from {path}: {len(zips)} ZIPs")
+        return cls(zips, state_ids, city_ids, states, cities)
+
+    def lookup(self, zip_code: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Lookup a ZIP in the table.
+
+        Args:
+            zip_code: 5-digit US zip code
+
+        Returns:
+            Tuple of (state_abbr, city), or None if the ZIP is not in the table
+        """
+        zip_code = zip_code.strip()[:5]
+        if not zip_code.isdigit():
+            self.misses += 1
+            return None
+
+        zip_int = int(zip_code)
+        i = bisect_left(self._zips, zip_int)
+        if i == len(self._zips) or self._zips[i] != zip_int:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        state = self._states[self._state_ids[i]] or None
+        city = self._cities[self._city_ids[i]] or None
+        return (state, city)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get table size and hit/miss counters."""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
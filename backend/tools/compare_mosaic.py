@@ -0,0 +1,198 @@
+"""
+Compare mosaic mode against per-image vision requests on real addresses.
+
+Each address's images and search context are fetched once, then analyzed
+in both modes with otherwise identical VisionOptions. The report shows
+tokens, latency and how far the mosaic WWR / building type drift from the
+per-image answers (and from ground truth when the CSV provides it).
+
+The local facade analyzer's WWR and certainty are reported next to them
+(local_* columns), which is how FACADE_SKIP_CERTAINTY should be calibrated
+before skipping vision calls is turned on.
+
+Usage (from backend/):
+    python -m tools.compare_mosaic addresses.csv [--limit 20] [--detail high]
+        [--output mosaic_report.csv]
+
+The CSV needs street_number, street_name and zip_code columns; optional
+wwr_truth and building_type_truth columns enable accuracy against truth.
+Uses the same API keys as the app (.env).
+"""
+
+import sys
+import csv
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import ImageDetail, VisionOptions  # noqa: E402
+from services import ZipService, ImageService, SearchService, VisionService  # noqa: E402
+
+MODES = ("per_image", "mosaic")
+
+
+async def analyze_address(
+    row: Dict[str, str],
+    zip_service: ZipService,
+    image_service: ImageService,
+    search_service: SearchService,
+    vision_service: VisionService,
+    options: VisionOptions
+) -> Optional[Dict]:
+    """Fetch one address's inputs once and analyze them in both modes."""
+    state, city = await zip_service.lookup(row["zip_code"])
+    address = zip_service.format_address(
+        row["street_number"], row["street_name"], row["zip_code"], state, city
+    )
+
+    images = await image_service.fetch_images(address)
+    if not images:
+        print(f"skip (no imagery): {address}")
+        return None
+
+    search_context = search_service.format_search_context(
+        await search_service.search_address(address)
+    )
+
+    report = {
+        "address": address,
+        "images": len(images),
+        "wwr_truth": row.get("wwr_truth", ""),
+        "building_type_truth": row.get("building_type_truth", ""),
+    }
+    for mode in MODES:
+        started = time.perf_counter()
+        result = await vision_service.analyze_building(
+            images=[image.data for image in images],
+            address=address,
+            search_context=search_context,
+            options=options.model_copy(update={"mosaic": mode == "mosaic"}),
+            labels=[f"{image.heading}deg" for image in images]
+        )
+        report[f"{mode}_seconds"] = round(time.perf_counter() - started, 2)
+        report[f"{mode}_tokens"] = result.usage.total_tokens if result.usage else 0
+        report[f"{mode}_prompt_tokens"] = result.usage.prompt_tokens if result.usage else 0
+        report[f"{mode}_wwr"] = result.wwr_estimate
+        report[f"{mode}_type"] = result.building_type.value
+        report[f"{mode}_confidence"] = result.confidence.value
+
+    # Same images in both modes, so the local estimate is the same too
+    facade = result.facade_estimate
+    report["local_wwr"] = facade.wwr_estimate if facade else ""
+    report["local_certainty"] = facade.certainty if facade else ""
+    report["local_views"] = facade.images if facade else ""
+    report["local_wwr_spread"] = facade.wwr_spread if facade and facade.wwr_spread is not None else ""
+
+    print(
+        f"{address}: tokens {report['per_image_tokens']} -> {report['mosaic_tokens']}, "
+        f"WWR {report['per_image_wwr']} -> {report['mosaic_wwr']}"
+    )
+    return report
+
+
+def summarize(reports: List[Dict]) -> None:
+    """Print aggregate cost, latency and agreement figures."""
+    print(f"\n{len(reports)} buildings compared")
+    for mode in MODES:
+        tokens = [r[f"{mode}_tokens"] for r in reports]
+        seconds = [r[f"{mode}_seconds"] for r in reports]
+        print(
+            f"  {mode:9s}  tokens total {sum(tokens)}, mean {statistics.mean(tokens):.0f}; "
+            f"latency mean {statistics.mean(seconds):.2f}s, "
+            f"median {statistics.median(seconds):.2f}s"
+        )
+
+    wwr_diff = [abs(r["mosaic_wwr"] - r["per_image_wwr"]) for r in reports]
+    type_match = [r["mosaic_type"] == r["per_image_type"] for r in reports]
+    print(
+        f"  mosaic vs per-image: WWR mean abs diff {statistics.mean(wwr_diff):.1f} pts, "
+        f"building type agreement {sum(type_match) / len(reports):.0%}"
+    )
+
+    local = sorted(
+        (r for r in reports if r["local_wwr"] != ""), key=lambda r: r["local_certainty"], reverse=True
+    )
+    if local:
+        # Local vs vision WWR for the most certain local estimates: where this
+        # stays small is a safe FACADE_SKIP_CERTAINTY
+        print("  local facade analyzer vs per-image WWR, by certainty:")
+        for share in (0.25, 0.5, 1.0):
+            top = local[:max(1, round(len(local) * share))]
+            diff = [abs(r["local_wwr"] - r["per_image_wwr"]) for r in top]
+            print(
+                f"    certainty >= {top[-1]['local_certainty']:.2f} ({len(top)} buildings): "
+                f"WWR mean abs diff {statistics.mean(diff):.1f} pts, max {max(diff)} pts"
+            )
+
+    truth = [r for r in reports if str(r["wwr_truth"]).strip()]
+    if truth:
+        for mode in MODES:
+            errors = [abs(r[f"{mode}_wwr"] - float(r["wwr_truth"])) for r in truth]
+            print(f"  {mode:9s}  WWR MAE vs truth {statistics.mean(errors):.1f} pts ({len(truth)} labelled)")
+
+    typed = [r for r in reports if r["building_type_truth"].strip()]
+    if typed:
+        for mode in MODES:
+            correct = [r[f"{mode}_type"] == r["building_type_truth"].strip() for r in typed]
+            print(f"  {mode:9s}  type accuracy vs truth {sum(correct) / len(typed):.0%}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    with open(args.csv, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))[:args.limit]
+
+    image_service = ImageService(output_dir=args.work_dir)
+    # Compare on in-memory images only; nothing needs to be kept on disk
+    image_service.persist_images = False
+    # No persistent vision cache: every analysis is a real, measured call
+    vision_service = VisionService()
+    options = vision_service.default_options().model_copy(
+        update={"detail": ImageDetail(args.detail)} if args.detail else {}
+    )
+
+    zip_service = ZipService()
+    search_service = SearchService()
+
+    reports = []
+    for row in rows:
+        try:
+            report = await analyze_address(
+                row, zip_service, image_service, search_service, vision_service, options
+            )
+        except Exception as e:
+            # API outage: leave the building out rather than compare a non-answer
+            print(f"skip (error: {e}): {row.get('street_number')} {row.get('street_name')}")
+            continue
+        if report:
+            reports.append(report)
+
+    if not reports:
+        print("No buildings could be compared")
+        return
+
+    summarize(reports)
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(reports[0]))
+            writer.writeheader()
+            writer.writerows(reports)
+        print(f"\nPer-building report written to {args.output}")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="Address CSV (street_number, street_name, zip_code[, wwr_truth, building_type_truth])")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum addresses to compare")
+    parser.add_argument("--detail", choices=[d.value for d in ImageDetail], help="Override VISION_DETAIL")
+    parser.add_argument("--output", help="Write the per-building comparison to this CSV")
+    parser.add_argument("--work-dir", default="output", help="ImageService output dir (unused while not persisting)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,290 @@
+"""
+Queue worker for Building Scanner (EXECUTION_MODE=queue).
+
+The API process stores each uploaded job and enqueues one task per
+address. Workers claim tasks from the shared SQLite queue, process the
+address with the same pipeline as inline mode while renewing the task's
+lease, checkpoint the result in the job store and complete the task. A
+worker that lost its lease drops its result instead. The worker completing a job's last task
+writes the results CSV and marks the job completed.
+
+Usage (from backend/, with the same .env / CACHE_DIR as the API):
+    python worker.py [--processes 4] [--concurrency 8]
+
+Run several processes to use all cores on one box; workers on other
+machines scale out the same way when they share CACHE_DIR and output/.
+The QUOTA_* and MAX_CONCURRENT_* limits are split evenly between the
+processes of one `worker.py`; separate `worker.py` invocations (other
+machines) each need their own share of the account limits in their .env.
+"""
+
+import os
+import signal
+import socket
+import asyncio
+import argparse
+import logging
+import multiprocessing
+from typing import Dict, List, Tuple
+
+from models import AddressInput, BuildingResult, BuildingType, Confidence, JobStatus
+from services import ImageIndex, concurrency_limits, executor, quota_governor
+
+from main import (
+    EXECUTION_MODE, image_service, job_store, task_queue, jobs,
+    process_single_address, append_results_csv, save_results_csv, start_services, stop_services
+)
+
+logger = logging.getLogger("worker")
+
+# Seconds between queue polls while idle
+POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+
+# Per-process state of the jobs this worker has claimed tasks from
+job_addresses: Dict[str, List[AddressInput]] = {}
+image_indexes: Dict[str, ImageIndex] = {}
+# Tasks being processed by this process's loops
+in_flight = 0
+
+
+class LeaseLost(Exception):
+    """The task's lease expired and another worker may have reclaimed it."""
+
+
+async def load_job(job_id: str) -> Tuple[JobStatus, List[AddressInput]]:
+    """Load a job and its addresses once per worker process."""
+    if job_id not in jobs:
+        job = await executor.run_io(job_store.load, job_id)
+        if job is None:
+            raise KeyError(f"Job {job_id} not found in the job store")
+        if job.status == "pending":
+            await executor.run_io(job_store.patch, job_id, status="processing")
+            job.status = "processing"
+        # process_single_address reads vision options and sets current_address here
+        job.results = None
+        jobs[job_id] = job
+        job_addresses[job_id] = await executor.run_io(job_store.get_addresses, job_id)
+        image_indexes[job_id] = ImageIndex()
+    return jobs[job_id], job_addresses[job_id]
+
+
+async def finalize_job(job_id: str):
+    """Write the results CSV of a job whose every address is done, and complete it."""
+    try:
+        job = await executor.run_io(job_store.load, job_id)
+        await save_results_csv(job_id, job.results or [])
+        await executor.run_io(
+            job_store.patch, job_id,
+            status="completed",
+            current_address=None,
+            processed_addresses=job.processed_addresses
+        )
+        logger.info(f"Job {job_id} completed successfully")
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        await executor.run_io(job_store.patch, job_id, status="failed", error=str(e))
+
+
+async def hold_lease(job_id: str, index: int, worker_id: str, coro):
+    """
+    Run `coro` while renewing the task's lease.
+
+    Raises:
+        LeaseLost: If a renewal finds the task no longer held by this
+            worker; `coro` is cancelled
+    """
+    work = asyncio.ensure_future(coro)
+    interval = task_queue.lease_seconds / 3
+    try:
+        while True:
+            done, _ = await asyncio.wait({work}, timeout=interval)
+            if done:
+                return work.result()
+            if not await executor.run_io(task_queue.renew, job_id, index, worker_id):
+                raise LeaseLost(f"Task {job_id}/{index} is no longer held by {worker_id}")
+    finally:
+        work.cancel()
+
+
+async def process_task(job_id: str, index: int, worker_id: str):
+    """Process one claimed address and complete its task."""
+    job, addresses = await load_job(job_id)
+
+    async def run() -> BuildingResult:
+        result = await process_single_address(addresses[index], job_id, image_indexes[job_id])
+        # Images must be on disk before the task (and possibly the job) completes
+        if result.images_folder:
+            await image_service.wait_background([result.images_folder])
+        return result
+
+    result = await hold_lease(job_id, index, worker_id, run())
+    await finish_task(job_id, index, worker_id, result)
+
+
+async def give_up_task(job_id: str, index: int, worker_id: str, error: str):
+    """Complete a task that used up its attempts with an error result."""
+    _, addresses = await load_job(job_id)
+    address = addresses[index]
+    result = BuildingResult(
+        street_number=address.street_number,
+        street_name=address.street_name,
+        zip_code=address.zip_code,
+        error=error,
+        building_type=BuildingType.MISC,
+        wwr_estimate=0,
+        confidence=Confidence.LOW,
+        reasoning=f"Processing error: {error}"
+    )
+    logger.error(f"Giving up on task {job_id}/{index}: {error}")
+    await finish_task(job_id, index, worker_id, result)
+
+
+async def finish_task(job_id: str, index: int, worker_id: str, result: BuildingResult):
+    """
+    Checkpoint a task's result, append it to the CSV and complete the task.
+
+    Nothing is written if the worker no longer holds the task: the worker
+    that reclaimed it saves its own result.
+    """
+    job = jobs[job_id]
+    if not await executor.run_io(job_store.save_result, job_id, index, result, worker_id):
+        logger.warning(f"Dropping the result of task {job_id}/{index}: its lease was lost")
+        return
+    await executor.run_io(job_store.patch, job_id, current_address=job.current_address)
+    try:
+        # Whichever worker closes a gap appends the in-order run it completes
+        await append_results_csv(
+            job_id, lambda start: job_store.get_results_since(job_id, start)
+        )
+    except Exception as e:
+        # Retried with the next result and when the job finishes
+        logger.error(f"Could not append to the results CSV of job {job_id}: {e}")
+
+    remaining = await executor.run_io(task_queue.complete, job_id, index, worker_id)
+    if remaining == 0:
+        await finalize_job(job_id)
+
+
+async def work(worker_id: str, stop: asyncio.Event):
+    """Claim and process tasks until `stop` is set."""
+    global in_flight
+    while not stop.is_set():
+        task = await executor.run_io(task_queue.claim, worker_id)
+        if task is None:
+            if in_flight == 0:
+                # Idle: forget finished jobs' state, then wait for new tasks
+                jobs.clear()
+                job_addresses.clear()
+                image_indexes.clear()
+            try:
+                await asyncio.wait_for(stop.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        job_id, index, attempts = task
+        in_flight += 1
+        try:
+            if attempts > task_queue.max_attempts:
+                # Earlier claims never finished (e.g. the worker crashed on it)
+                await give_up_task(
+                    job_id, index, worker_id,
+                    f"Not finished after {task_queue.max_attempts} attempts"
+                )
+            else:
+                await process_task(job_id, index, worker_id)
+        except asyncio.CancelledError:
+            await executor.run_io(task_queue.release, job_id, index, worker_id)
+            raise
+        except LeaseLost as e:
+            # The task belongs to whichever worker reclaimed it now
+            logger.warning(f"Worker {worker_id} abandoning task: {e}")
+        except KeyError as e:
+            # The job was deleted from the store; drop its task
+            logger.error(f"Worker {worker_id} dropping task {job_id}/{index}: {e}")
+            await executor.run_io(task_queue.complete, job_id, index, worker_id)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} failed on task {job_id}/{index} (attempt {attempts}): {e}")
+            try:
+                # None: the lease was lost and another worker holds the task
+                if await executor.run_io(task_queue.fail, job_id, index, worker_id) is False:
+                    await give_up_task(job_id, index, worker_id, str(e))
+            except Exception as give_up_error:
+                # Left running; the lease expires and the next claim gives up on it
+                logger.error(f"Worker {worker_id} could not fail task {job_id}/{index}: {give_up_error}")
+        finally:
+            in_flight -= 1
+
+
+async def run_worker(concurrency: int):
+    """Run `concurrency` task loops in this process until SIGINT/SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    http_pool = await start_services()
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Worker {name} started with {concurrency} concurrent addresses")
+    try:
+        # Each loop finishes its current address after a stop signal
+        await asyncio.gather(*(work(f"{name}/{i}", stop) for i in range(concurrency)))
+    finally:
+        await stop_services(http_pool)
+        logger.info(f"Worker {name} stopped")
+
+
+def worker_process(concurrency: int, processes: int = 1):
+    """
+    Entry point of one worker process.
+
+    Quotas and upstream caps are per process, so each of `processes`
+    siblings takes an equal share and together they stay within the
+    configured QUOTA_* and MAX_CONCURRENT_* values.
+    """
+    quota_governor.split(processes)
+    concurrency_limits.split(processes)
+    asyncio.run(run_worker(concurrency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--processes", type=int,
+        default=int(os.getenv("WORKER_PROCESSES", "1")),
+        help="Worker processes to run (default WORKER_PROCESSES or 1)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int,
+        default=concurrency_limits.addresses,
+        help="Addresses processed concurrently per process (default MAX_CONCURRENT_ADDRESSES)"
+    )
+    args = parser.parse_args()
+
+    if EXECUTION_MODE != "queue":
+        logger.warning("EXECUTION_MODE is not 'queue'; the API runs jobs itself and enqueues nothing")
+
+    if args.processes <= 1:
+        worker_process(args.concurrency)
+    else:
+        # Spawn, not fork: each process opens its own SQLite connections and pools
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=worker_process, args=(args.concurrency, args.processes), name=f"worker-{i}"
+            )
+            for i in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            # Children finish their current addresses, then exit
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGINT, forward)
+        signal.signal(signal.SIGTERM, forward)
+        for process in processes:
+            process.join()
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import FileUpload from './components/FileUpload';
 import ProcessingStatus from './components/ProcessingStatus';
 import ResultsView from './components/ResultsView';
@@ -172,6 +172,8 @@ function App() {
   const [jobStatus, setJobStatus] = useState(null);
   const [results, setResults] = useState(null);
   const [error, setError] = useState(null);
+  // Results pushed by the progress stream, by input index
+  const streamedResults = useRef([]);
 
   const pollStatus = useCallback(async () => {
     if (!jobId) return;
@@ -186,12 +188,20 @@ function App() {
       setJobStatus(status);
 
       if (status.status === 'completed') {
-        const resultsResponse = await fetch(`${API_BASE}/results/${jobId}/json`);
-        if (resultsResponse.ok) {
+        // Results come in pages; follow the cursor until the last one
+        const allResults = [];
+        let since = 0;
+        let hasMore = true;
+        while (hasMore) {
+          const resultsResponse = await fetch(`${API_BASE}/results/${jobId}/json?since=${since}`);
+          if (!resultsResponse.ok) return;
           const resultsData = await resultsResponse.json();
-          setResults(resultsData.results);
-          setView('results');
+          allResults.push(...resultsData.results);
+          hasMore = resultsData.has_more && resultsData.next_since > since;
+          since = resultsData.next_since;
         }
+        setResults(allResults);
+        setView('results');
       } else if (status.status === 'failed') {
         setError(status.error || 'Job failed');
         setView('upload');
@@ -204,13 +214,57 @@ function App() {
 
   useEffect(() => {
     let intervalId;
+    let eventSource;
 
-    if (view === 'processing' && jobId) {
+    const startPolling = () => {
+      if (intervalId) return;
       intervalId = setInterval(pollStatus, 2000);
       pollStatus();
+    };
+
+    if (view === 'processing' && jobId) {
+      if (window.EventSource) {
+        // One long-lived connection pushing progress and each finished result
+        streamedResults.current = [];
+        eventSource = new EventSource(`${API_BASE}/events/${jobId}`);
+
+        eventSource.addEventListener('progress', (event) => {
+          setJobStatus(JSON.parse(event.data));
+        });
+
+        eventSource.addEventListener('result', (event) => {
+          const { index, result } = JSON.parse(event.data);
+          streamedResults.current[index] = result;
+        });
+
+        eventSource.addEventListener('done', (event) => {
+          const { status, error: jobError } = JSON.parse(event.data);
+          eventSource.close();
+          if (status === 'completed') {
+            setResults(streamedResults.current.filter(Boolean));
+            setView('results');
+          } else {
+            setError(jobError || 'Job failed');
+            setView('upload');
+          }
+        });
+
+        eventSource.onerror = () => {
+          // EventSource retries dropped connections itself (resuming after
+          // the last result); fall back to polling only once it gives up
+          if (eventSource.readyState === EventSource.CLOSED) {
+            startPolling();
+          }
+        };
+      } else {
+        startPolling();
+      }
     }
 
     return () => {
+      if (eventSource) {
+        eventSource.close();
+      }
       if (intervalId) {
         clearInterval(intervalId);
       }
@@ -1,5 +1,7 @@
 import React from 'react';
 
+const API_BASE = import.meta.env.DEV ? 'http://localhost:8000/api' : '/api';
+
 const styles = {
   container: {
     maxWidth: '600px',
@@ -203,6 +205,19 @@ const styles = {
     fontSize: '13px',
     color: '#6b7280',
   },
+  partialDownload: {
+    display: 'block',
+    width: '100%',
+    marginTop: '12px',
+    padding: '10px',
+    background: 'white',
+    color: '#374151',
+    border: '1px solid #e5e7eb',
+    borderRadius: '8px',
+    fontSize: '13px',
+    fontWeight: '600',
+    cursor: 'pointer',
+  },
 };
 
 const spinnerKeyframes = `
@@ -331,6 +346,15 @@ export default function ProcessingStatus({ jobStatus }) {
           </div>
         )}
 
+        {isProcessing && processed_addresses > 0 && (
+          <button
+            style={styles.partialDownload}
+            onClick={() => window.open(`${API_BASE}/results/${job_id}`, '_blank')}
+          >
+            📥 Download results so far (CSV)
+          </button>
+        )}
+
         {error && (
           <div style={styles.error}>
             <span>⚠️</span>
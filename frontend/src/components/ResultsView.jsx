@@ -363,9 +363,18 @@ export default function ResultsView({ results, jobId, onNewScan }) {
     window.open(`${API_BASE}/download/${jobId}/zip`, '_blank');
   };
 
-  const handleViewImages = (imagesFolder, address) => {
-    if (imagesFolder) {
-      setSelectedImages({ folder: imagesFolder, address });
+  const handleViewImages = async (imagesFolder, address) => {
+    if (!imagesFolder) return;
+
+    setSelectedImages({ folder: imagesFolder, address, files: [] });
+    try {
+      const response = await fetch(`${API_BASE}/images/${imagesFolder}`);
+      if (response.ok) {
+        const data = await response.json();
+        setSelectedImages({ folder: imagesFolder, address, files: Object.keys(data.images) });
+      }
+    } catch (err) {
+      console.error('Error loading images:', err);
     }
   };
 
@@ -565,10 +574,10 @@ export default function ResultsView({ results, jobId, onNewScan }) {
               </button>
             </div>
             <div style={styles.imageGrid}>
-              {[0, 1, 2, 3].map((i) => (
+              {selectedImages.files.map((filename, i) => (
                 <img
-                  key={i}
-                  src={`${API_BASE}/images/${selectedImages.folder}/streetview_${i}_${i * 90}deg.jpg`}
+                  key={filename}
+                  src={`${API_BASE}/images/${selectedImages.folder}/${filename}?variant=download`}
                   alt={`Street view ${i + 1}`}
                   style={styles.image}
                   onError={(e) => {